@@ -1,14 +1,33 @@
-from flask import Flask, render_template, request, redirect, url_for, flash, jsonify, send_from_directory
+from flask import Flask, render_template, request, redirect, url_for, flash, jsonify, send_from_directory, session
 from flask_sqlalchemy import SQLAlchemy
 from flask_login import LoginManager, UserMixin, login_user, logout_user, login_required, current_user
+from flask_migrate import Migrate
 from werkzeug.security import generate_password_hash, check_password_hash
 from werkzeug.utils import secure_filename
-from datetime import datetime
+from datetime import datetime, timedelta
 from dotenv import load_dotenv
 import os
+import io
+import csv
+import json
+import sqlite3
+import math
+import re
+import bisect
+import threading
+import time
+import click
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+import numpy as np
 from geopy.distance import geodesic
-from collections import defaultdict
+from collections import defaultdict, OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from sqlalchemy import event, exc, inspect
+from sqlalchemy.orm import make_transient_to_detached
+from sqlalchemy.dialects.postgresql import insert as postgresql_insert
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
 
 # Load environment variables
 load_dotenv()
@@ -20,14 +39,46 @@ app.config['SQLALCHEMY_DATABASE_URI'] = os.getenv('DATABASE_URL')
 app.config['SQLALCHEMY_TRACK_MODIFICATIONS'] = False
 app.config['UPLOAD_FOLDER'] = 'static/uploads/resumes'
 app.config['MAX_CONTENT_LENGTH'] = 16 * 1024 * 1024  # 16MB max file size
+app.config['DISTANCE_MODE'] = os.getenv('DISTANCE_MODE', 'haversine')  # 'haversine' or 'geodesic'
+app.config['DISTANCE_CACHE_MAX_ENTRIES'] = int(os.getenv('DISTANCE_CACHE_MAX_ENTRIES', 200000))  # 0 disables
+app.config['USER_CACHE_TTL_SECONDS'] = float(os.getenv('USER_CACHE_TTL_SECONDS', 60))  # 0 disables
+app.config['USER_CACHE_MAX_ENTRIES'] = int(os.getenv('USER_CACHE_MAX_ENTRIES', 10000))
+app.config['PRINCIPAL_MAX_AGE_SECONDS'] = int(os.getenv('PRINCIPAL_MAX_AGE_SECONDS', 300))  # re-read the user row after this
+app.config['PASSWORD_HASH_METHOD'] = os.getenv('PASSWORD_HASH_METHOD', 'scrypt:32768:8:1')  # or e.g. 'pbkdf2:sha256:600000'
+app.config['PASSWORD_HASH_WORKERS'] = int(os.getenv('PASSWORD_HASH_WORKERS', os.cpu_count() or 2))
+app.config['PASSWORD_HASH_QUEUE'] = int(os.getenv('PASSWORD_HASH_QUEUE', 32))  # logins allowed to wait for a worker
+app.config['PASSWORD_HASH_QUEUE_TIMEOUT'] = float(os.getenv('PASSWORD_HASH_QUEUE_TIMEOUT', 5))
+app.config['SEARCH_PAGE_SIZE'] = 20
+app.config['SEARCH_MAX_PAGE_SIZE'] = 50
+app.config['APPLICATIONS_PAGE_SIZE'] = 25
+app.config['GEOCODE_CACHE_TTL_DAYS'] = int(os.getenv('GEOCODE_CACHE_TTL_DAYS', 30))
+app.config['GEOCODE_CACHE_MAX_ENTRIES'] = int(os.getenv('GEOCODE_CACHE_MAX_ENTRIES', 10000))
+app.config['MAPBOX_GEOCODING_URL'] = os.getenv('MAPBOX_GEOCODING_URL', 'https://api.mapbox.com/geocoding/v5/mapbox.places')
+app.config['GEOCODE_CONNECT_TIMEOUT'] = float(os.getenv('GEOCODE_CONNECT_TIMEOUT', 3.05))
+app.config['GEOCODE_READ_TIMEOUT'] = float(os.getenv('GEOCODE_READ_TIMEOUT', 10))
+app.config['GEOCODE_MAX_RETRIES'] = int(os.getenv('GEOCODE_MAX_RETRIES', 2))
+app.config['GEOCODE_BACKOFF_FACTOR'] = 0.3
+app.config['GEOCODE_BREAKER_THRESHOLD'] = 5  # consecutive failures before the circuit opens
+app.config['GEOCODE_BREAKER_RESET_SECONDS'] = 60
+app.config['GEOCODER_BACKENDS'] = os.getenv('GEOCODER_BACKENDS', 'offline,mapbox')  # tried in order
+app.config['GAZETTEER_PATH'] = os.getenv('GAZETTEER_PATH')  # CSV or SQLite file for the offline geocoder
+app.config['ASYNC_GEOCODING'] = os.getenv('ASYNC_GEOCODING', 'false').lower() == 'true'
+app.config['GEOCODE_WORKERS'] = int(os.getenv('GEOCODE_WORKERS', 4))
+app.config['GEOCODE_RETRY_LIMIT'] = 5  # background retries while the geocoder is unreachable
+app.config['GEOCODE_RETRY_BACKOFF_SECONDS'] = 30  # doubled after each retry
+app.config['JOB_IMPORT_MAX_ROWS'] = 1000
+app.config['SERVICE_AREAS_PATH'] = os.getenv('SERVICE_AREAS_PATH')  # GeoJSON file of service zones
+app.config['SERVICE_AREA_GRID_DEGREES'] = 0.25  # cell size of the service zone spatial index
 
 # Initialize extensions
 db = SQLAlchemy(app)
+migrate = Migrate(app, db, render_as_batch=True)
 login_manager = LoginManager(app)
 login_manager.login_view = 'login'
 
 # Allowed file extensions
 ALLOWED_EXTENSIONS = {'pdf'}
+JOB_IMPORT_EXTENSIONS = {'csv', 'json'}
 
 def allowed_file(filename):
     return '.' in filename and filename.rsplit('.', 1)[1].lower() in ALLOWED_EXTENSIONS
@@ -70,7 +121,7 @@ class User(UserMixin, db.Model):
     saved_jobs = db.relationship('SavedJob', backref='user', lazy=True, cascade='all, delete-orphan')
     
     def set_password(self, password):
-        self.password_hash = generate_password_hash(password)
+        self.password_hash = generate_password_hash(password, method=app.config['PASSWORD_HASH_METHOD'])
     
     def check_password(self, password):
         return check_password_hash(self.password_hash, password)
@@ -81,6 +132,11 @@ class User(UserMixin, db.Model):
 
 class JobPosting(db.Model):
     __tablename__ = 'job_postings'
+    __table_args__ = (
+        db.Index('ix_job_postings_lat_lng', 'latitude', 'longitude'),
+        db.Index('ix_job_postings_status_lat_lng', 'status', 'latitude', 'longitude'),
+        db.Index('ix_job_postings_employer_created', 'employer_id', 'created_at'),
+    )
     
     id = db.Column(db.Integer, primary_key=True)
     employer_id = db.Column(db.Integer, db.ForeignKey('users.id'), nullable=False)
@@ -97,12 +153,22 @@ class JobPosting(db.Model):
     street_address = db.Column(db.String(200), nullable=False)
     city = db.Column(db.String(100), nullable=False)
     zip_code = db.Column(db.String(10), nullable=False)
-    latitude = db.Column(db.Float, nullable=False)
-    longitude = db.Column(db.Float, nullable=False)
+    latitude = db.Column(db.Float)  # NULL while status is 'pending_geocode'
+    longitude = db.Column(db.Float)
+    geohash = db.Column(db.String(12))
+    region = db.Column(db.String(100), index=True)  # name of the containing service zone
     
     # Status
     status = db.Column(db.String(20), default='active')
     
+    # Application counters (maintained by adjust_application_counters)
+    application_count = db.Column(db.Integer, default=0, server_default='0', nullable=False)
+    applied_count = db.Column(db.Integer, default=0, server_default='0', nullable=False)
+    under_review_count = db.Column(db.Integer, default=0, server_default='0', nullable=False)
+    interview_count = db.Column(db.Integer, default=0, server_default='0', nullable=False)
+    rejected_count = db.Column(db.Integer, default=0, server_default='0', nullable=False)
+    accepted_count = db.Column(db.Integer, default=0, server_default='0', nullable=False)
+    
     # Timestamps
     created_at = db.Column(db.DateTime, default=datetime.utcnow)
     updated_at = db.Column(db.DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
@@ -115,8 +181,17 @@ class JobPosting(db.Model):
         return f'<JobPosting {self.title}>'
 
 
+APPLICATION_STATUSES = ('applied', 'under_review', 'interview', 'rejected', 'accepted')
+
+
 class Application(db.Model):
     __tablename__ = 'applications'
+    __table_args__ = (
+        db.Index('ix_applications_job_status_submitted', 'job_id', 'status', 'submitted_at'),
+        db.Index('ix_applications_job_submitted', 'job_id', 'submitted_at'),
+        db.Index('ix_applications_applicant_submitted', 'applicant_id', 'submitted_at'),
+        db.UniqueConstraint('job_id', 'applicant_id', name='uq_applications_job_applicant'),
+    )
     
     id = db.Column(db.Integer, primary_key=True)
     job_id = db.Column(db.Integer, db.ForeignKey('job_postings.id'), nullable=False)
@@ -135,11 +210,30 @@ class Application(db.Model):
         return f'<Application {self.id}>'
 
 
+class AnalyticsRollup(db.Model):
+    __tablename__ = 'analytics_rollups'
+    __table_args__ = (
+        db.UniqueConstraint('employer_id', 'month', 'status', name='uq_analytics_rollups_employer_month_status'),
+    )
+    
+    id = db.Column(db.Integer, primary_key=True)
+    employer_id = db.Column(db.Integer, db.ForeignKey('users.id'), nullable=False)
+    month = db.Column(db.String(7), nullable=False)  # 'YYYY-MM' of submitted_at
+    status = db.Column(db.String(50), nullable=False)
+    
+    # Aggregates (maintained by adjust_analytics_rollup)
+    application_count = db.Column(db.Integer, default=0, nullable=False)
+    response_days = db.Column(db.Integer, default=0, nullable=False)
+    
+    def __repr__(self):
+        return f'<AnalyticsRollup {self.employer_id} {self.month} {self.status}>'
+
+
 class Resume(db.Model):
     __tablename__ = 'resumes'
     
     id = db.Column(db.Integer, primary_key=True)
-    user_id = db.Column(db.Integer, db.ForeignKey('users.id'), nullable=False)
+    user_id = db.Column(db.Integer, db.ForeignKey('users.id'), nullable=False, index=True)
     filename = db.Column(db.String(255), nullable=False)
     original_filename = db.Column(db.String(255), nullable=False)
     uploaded_at = db.Column(db.DateTime, default=datetime.utcnow)
@@ -150,6 +244,10 @@ class Resume(db.Model):
 
 class SavedJob(db.Model):
     __tablename__ = 'saved_jobs'
+    __table_args__ = (
+        db.Index('ix_saved_jobs_user_saved', 'user_id', 'saved_at'),
+        db.UniqueConstraint('user_id', 'job_id', name='uq_saved_jobs_user_job'),
+    )
     
     id = db.Column(db.Integer, primary_key=True)
     user_id = db.Column(db.Integer, db.ForeignKey('users.id'), nullable=False)
@@ -160,27 +258,500 @@ class SavedJob(db.Model):
         return f'<SavedJob {self.id}>'
 
 
+class GeocodeCache(db.Model):
+    __tablename__ = 'geocode_cache'
+    
+    address_key = db.Column(db.String(400), primary_key=True)
+    latitude = db.Column(db.Float, nullable=False)
+    longitude = db.Column(db.Float, nullable=False)
+    
+    # Timestamps
+    created_at = db.Column(db.DateTime, default=datetime.utcnow, nullable=False)
+    last_used_at = db.Column(db.DateTime, default=datetime.utcnow, nullable=False, index=True)
+    
+    def __repr__(self):
+        return f'<GeocodeCache {self.address_key}>'
+
+
+class Principal:
+    """Compact identity of the signed-in user, stored in the signed session cookie.
+    
+    Holds what authorization checks and distance calculations need, so most
+    requests never load the users row. Routes that render profile data load
+    the full User with current_profile().
+    """
+    
+    __slots__ = ('id', 'role', 'latitude', 'longitude', 'full_name')
+    
+    is_authenticated = True
+    is_active = True
+    is_anonymous = False
+    
+    def __init__(self, id, role, latitude, longitude, full_name):
+        self.id = id
+        self.role = role
+        self.latitude = latitude
+        self.longitude = longitude
+        self.full_name = full_name
+    
+    @classmethod
+    def from_user(cls, user):
+        return cls(user.id, user.role, user.latitude, user.longitude, user.full_name)
+    
+    def get_id(self):
+        return str(self.id)
+    
+    def __repr__(self):
+        return f'<Principal {self.id} {self.role}>'
+
+
+def remember_principal(user):
+    """Store the user's principal in the session, stamped with the time it was issued"""
+    principal = Principal.from_user(user)
+    session['principal'] = [principal.id, principal.role, principal.latitude,
+                            principal.longitude, principal.full_name, int(time.time())]
+    return principal
+
+
+def get_user(user_id):
+    """Return the full User, served from user_cache when possible"""
+    values = user_cache.get(user_id)
+    if values is None:
+        user = db.session.get(User, user_id)
+        if user:
+            user_cache.store(user)
+        return user
+    
+    # Rebuild the row from the cache and attach it to the session without a SELECT;
+    # lazy relationships and profile edits keep working as on a queried User
+    user = User(**values)
+    make_transient_to_detached(user)
+    return db.session.merge(user, load=False)
+
+
+def current_profile():
+    """Full User row of the signed-in user, for routes that render or edit the profile"""
+    return get_user(current_user.id)
+
+
 @login_manager.user_loader
 def load_user(user_id):
-    return User.query.get(int(user_id))
+    user_id = int(user_id)
+    data = session.get('principal')
+    if data and data[0] == user_id and time.time() - data[5] < app.config['PRINCIPAL_MAX_AGE_SECONDS']:
+        return Principal(*data[:5])
+    
+    # Missing (e.g. restored from the remember-me cookie) or old enough that a
+    # profile edit made from another session may not be reflected yet
+    user = get_user(user_id)
+    if user is None:
+        return None
+    return remember_principal(user)
+
+
+@event.listens_for(JobPosting, 'before_insert')
+@event.listens_for(JobPosting, 'before_update')
+def update_job_location_index(mapper, connection, job):
+    """Keep the geohash spatial index and service region in sync with the job coordinates"""
+    state = inspect(job)
+    if job.id is not None and (state.attrs.latitude.history.has_changes() or
+                               state.attrs.longitude.history.has_changes()):
+        distance_cache.invalidate_job(job.id)
+    
+    if job.latitude is not None and job.longitude is not None:
+        job.geohash = encode_geohash(job.latitude, job.longitude)
+        job.region = locate_service_area(job.latitude, job.longitude)
+    else:
+        job.geohash = None
+        job.region = None
 
 
 # ============================================================================
 # HELPER FUNCTIONS
 # ============================================================================
 
-def geocode_address(address, city, zip_code):
-    """Convert address to latitude and longitude using Mapbox Geocoding API"""
-    full_address = f"{address}, {city}, {zip_code}"
+GEOHASH_BASE32 = '0123456789bcdefghjkmnpqrstuvwxyz'
+GEOHASH_PRECISION = 9
+EARTH_RADIUS_KM = 6371.0088
+WGS84_MIN_RADIUS_KM = 6335.439  # meridional radius of curvature at the equator
+BOUNDING_BOX_PADDING = 1.001
+DISTANCE_MODES = ('haversine', 'geodesic')
+
+
+def encode_geohash(lat, lng, precision=GEOHASH_PRECISION):
+    """Encode a coordinate pair as a geohash string"""
+    lat_range = [-90.0, 90.0]
+    lng_range = [-180.0, 180.0]
+    geohash = []
+    bits = 0
+    bit_count = 0
+    even = True
+    
+    while len(geohash) < precision:
+        value, value_range = (lng, lng_range) if even else (lat, lat_range)
+        mid = (value_range[0] + value_range[1]) / 2
+        if value >= mid:
+            bits = bits * 2 + 1
+            value_range[0] = mid
+        else:
+            bits = bits * 2
+            value_range[1] = mid
+        
+        even = not even
+        bit_count += 1
+        if bit_count == 5:
+            geohash.append(GEOHASH_BASE32[bits])
+            bits = 0
+            bit_count = 0
+    
+    return ''.join(geohash)
+
+
+def bounding_box(lat, lng, radius_km, mode=None):
+    """Return (min_lat, max_lat, min_lng, max_lng) enclosing a radius around a point.
+    
+    Degrees are derived on a sphere no larger than the one distances are
+    measured on (the smallest WGS84 radius of curvature for geodesic mode)
+    and the radius is padded slightly, so the box never excludes a point
+    within radius_km.
+    """
+    mode = mode or app.config['DISTANCE_MODE']
+    earth_radius = WGS84_MIN_RADIUS_KM if mode == 'geodesic' else EARTH_RADIUS_KM
+    angle = radius_km * BOUNDING_BOX_PADDING / earth_radius
+    delta_lat = math.degrees(angle)
+    min_lat = max(lat - delta_lat, -90.0)
+    max_lat = min(lat + delta_lat, 90.0)
+    
+    # A circle that reaches a pole spans every longitude
+    if min_lat == -90.0 or max_lat == 90.0 or angle >= math.pi / 2:
+        return min_lat, max_lat, -180.0, 180.0
+    
+    # Widest longitude extent of a spherical cap around lat
+    delta_lng = math.degrees(math.asin(min(math.sin(angle) / math.cos(math.radians(lat)), 1.0)))
+    return (
+        min_lat,
+        max_lat,
+        max(lng - delta_lng, -180.0),
+        min(lng + delta_lng, 180.0)
+    )
+
+
+JOB_TSVECTOR_SQL = "to_tsvector('english', coalesce(title, '') || ' ' || coalesce(description, ''))"
+
+SQLITE_SEARCH_INDEX_DDL = [
+    """CREATE VIRTUAL TABLE IF NOT EXISTS job_postings_fts
+       USING fts5(title, description, content='job_postings', content_rowid='id')""",
+    """CREATE TRIGGER IF NOT EXISTS job_postings_fts_ai AFTER INSERT ON job_postings BEGIN
+           INSERT INTO job_postings_fts(rowid, title, description)
+           VALUES (new.id, new.title, new.description);
+       END""",
+    """CREATE TRIGGER IF NOT EXISTS job_postings_fts_ad AFTER DELETE ON job_postings BEGIN
+           INSERT INTO job_postings_fts(job_postings_fts, rowid, title, description)
+           VALUES ('delete', old.id, old.title, old.description);
+       END""",
+    """CREATE TRIGGER IF NOT EXISTS job_postings_fts_au AFTER UPDATE OF title, description ON job_postings BEGIN
+           INSERT INTO job_postings_fts(job_postings_fts, rowid, title, description)
+           VALUES ('delete', old.id, old.title, old.description);
+           INSERT INTO job_postings_fts(rowid, title, description)
+           VALUES (new.id, new.title, new.description);
+       END""",
+]
+
+POSTGRES_SEARCH_INDEX_DDL = [
+    f"CREATE INDEX IF NOT EXISTS ix_job_postings_fts ON job_postings USING GIN ({JOB_TSVECTOR_SQL})",
+]
+
+
+def init_search_index(rebuild=False):
+    """Create the full-text index for job keyword search if the database supports one"""
+    dialect = db.engine.dialect.name
+    
+    if dialect == 'sqlite':
+        exists = db.session.execute(db.text(
+            "SELECT 1 FROM sqlite_master WHERE name = 'job_postings_fts'"
+        )).first()
+        for statement in SQLITE_SEARCH_INDEX_DDL:
+            db.session.execute(db.text(statement))
+        if rebuild or not exists:
+            db.session.execute(db.text("INSERT INTO job_postings_fts(job_postings_fts) VALUES ('rebuild')"))
+    elif dialect == 'postgresql':
+        for statement in POSTGRES_SEARCH_INDEX_DDL:
+            db.session.execute(db.text(statement))
+    
+    db.session.commit()
+
+
+search_index_ready = False
+
+
+def sqlite_search_index_exists():
+    """Whether the FTS5 table exists; it is only created by init_search_index or the migrations"""
+    global search_index_ready
+    if not search_index_ready:
+        search_index_ready = db.session.execute(db.text(
+            "SELECT 1 FROM sqlite_master WHERE name = 'job_postings_fts'"
+        )).first() is not None
+    return search_index_ready
+
+
+def keyword_search(query, keyword):
+    """Restrict a JobPosting query to keyword matches.
+    
+    Adds a `rank` column to each row (lower is more relevant). Uses FTS5 on
+    SQLite and tsvector on Postgres, falling back to ILIKE elsewhere or while
+    the SQLite search index has not been created.
+    """
+    dialect = db.engine.dialect.name
+    terms = re.findall(r'\w+', keyword)
+    
+    if terms and dialect == 'sqlite' and sqlite_search_index_exists():
+        fts_query = ' '.join(f'"{term}"*' for term in terms)
+        matches = db.text(
+            "SELECT rowid AS job_id, bm25(job_postings_fts) AS rank "
+            "FROM job_postings_fts WHERE job_postings_fts MATCH :fts_query"
+        )
+    elif terms and dialect == 'postgresql':
+        fts_query = ' '.join(terms)
+        matches = db.text(
+            f"SELECT id AS job_id, -ts_rank({JOB_TSVECTOR_SQL}, plainto_tsquery('english', :fts_query)) AS rank "
+            f"FROM job_postings WHERE {JOB_TSVECTOR_SQL} @@ plainto_tsquery('english', :fts_query)"
+        )
+    else:
+        return query.filter(
+            db.or_(
+                JobPosting.title.ilike(f'%{keyword}%'),
+                JobPosting.description.ilike(f'%{keyword}%')
+            )
+        ).add_columns(db.literal(0.0).label('rank'))
+    
+    matches = matches.bindparams(fts_query=fts_query).columns(job_id=db.Integer, rank=db.Float).subquery('fts')
+    return query.join(matches, matches.c.job_id == JobPosting.id).add_columns(matches.c.rank)
+
+
+def search_candidates_query(lat, lng, radius_km, keyword='', category='', region=''):
+    """Build the search_jobs query for active jobs that may lie within radius_km.
+    
+    Returns (id, latitude, longitude, rank) rows; the caller computes exact
+    distances and ranks them.
+    """
+    # Only fetch the columns needed to rank candidates; full rows are loaded per page
+    query = db.session.query(
+        JobPosting.id,
+        JobPosting.latitude,
+        JobPosting.longitude
+    ).filter(JobPosting.status == 'active')
+    
+    if keyword:
+        query = keyword_search(query, keyword)
+    else:
+        query = query.add_columns(db.literal(0.0).label('rank'))
+    
+    if category:
+        query = query.filter(JobPosting.category == category)
+    
+    if region:
+        query = query.filter(JobPosting.region == region)
+    
+    # Discard rows outside the radius bounding box before any distance math;
+    # (status, latitude, longitude) is indexed so this is a single range scan
+    min_lat, max_lat, min_lng, max_lng = bounding_box(lat, lng, radius_km, app.config['DISTANCE_MODE'])
+    query = query.filter(
+        JobPosting.latitude.between(min_lat, max_lat),
+        JobPosting.longitude.between(min_lng, max_lng)
+    )
+    
+    return query
+
+
+def month_bucket(column):
+    """SQL expression truncating a datetime column to a 'YYYY-MM' string"""
+    if db.engine.dialect.name == 'postgresql':
+        return db.func.to_char(column, 'YYYY-MM')
+    return db.func.strftime('%Y-%m', column)
+
+
+def elapsed_days(start, end):
+    """SQL expression for the whole days elapsed between two datetime columns"""
+    if db.engine.dialect.name == 'postgresql':
+        return db.extract('day', end - start)
+    return db.cast(db.func.julianday(end) - db.func.julianday(start), db.Integer)
+
+
+def encode_search_cursor(sort_key):
+    """Encode a (distance, rank, job_id) sort key as an opaque page cursor"""
+    distance, rank, job_id = sort_key
+    return f"{float(distance)!r}:{float(rank)!r}:{int(job_id)}"
+
+
+def decode_search_cursor(cursor):
+    """Decode a page cursor back into a (distance, rank, job_id) sort key"""
+    try:
+        distance, rank, job_id = cursor.split(':')
+        return float(distance), float(rank), int(job_id)
+    except (AttributeError, ValueError):
+        return None
+
+
+def encode_application_cursor(application):
+    """Encode an application's (submitted_at, id) sort key as an opaque page cursor"""
+    return f"{application.submitted_at.isoformat()}|{application.id}"
+
+
+def decode_application_cursor(cursor):
+    """Decode a page cursor back into a (submitted_at, id) sort key"""
+    try:
+        submitted_at, application_id = cursor.split('|')
+        return datetime.fromisoformat(submitted_at), int(application_id)
+    except (AttributeError, ValueError):
+        return None
+
+
+def normalize_address(address, city, zip_code):
+    """Normalize an address into a cache key (case and whitespace insensitive)"""
+    parts = [' '.join(str(part or '').lower().replace(',', ' ').split()) for part in (address, city, zip_code)]
+    return ', '.join(parts)
+
+
+def get_cached_geocode(address_key):
+    """Return cached (lat, lng) for a normalized address, or None if missing or expired"""
+    table = GeocodeCache.__table__
+    now = datetime.utcnow()
+    expires_before = now - timedelta(days=app.config['GEOCODE_CACHE_TTL_DAYS'])
+    
+    try:
+        with db.engine.begin() as connection:
+            row = connection.execute(db.select(table.c.latitude, table.c.longitude).where(
+                table.c.address_key == address_key,
+                table.c.created_at >= expires_before
+            )).first()
+            if row:
+                connection.execute(table.update().where(
+                    table.c.address_key == address_key
+                ).values(last_used_at=now))
+    except exc.SQLAlchemyError as e:
+        print(f"Geocode cache error: {e}")
+        return None
+    
+    return (row.latitude, row.longitude) if row else None
+
+
+def store_cached_geocode(address_key, lat, lng):
+    """Cache a geocoding result, evicting the least recently used entries beyond the limit"""
+    table = GeocodeCache.__table__
+    now = datetime.utcnow()
+    
+    # Runs in its own transaction so it never commits the caller's pending changes
+    try:
+        with db.engine.begin() as connection:
+            connection.execute(table.delete().where(table.c.address_key == address_key))
+            connection.execute(table.insert().values(
+                address_key=address_key,
+                latitude=lat,
+                longitude=lng,
+                created_at=now,
+                last_used_at=now
+            ))
+            
+            entries = connection.execute(db.select(db.func.count()).select_from(table)).scalar()
+            overflow = entries - app.config['GEOCODE_CACHE_MAX_ENTRIES']
+            if overflow > 0:
+                stale_keys = db.select(table.c.address_key).order_by(table.c.last_used_at).limit(overflow)
+                connection.execute(table.delete().where(table.c.address_key.in_(stale_keys.scalar_subquery())))
+    except exc.SQLAlchemyError as e:
+        print(f"Geocode cache error: {e}")
+
+
+class CircuitBreaker:
+    """Stops calling a failing upstream until a cool-down period has passed"""
+    
+    def __init__(self, failure_threshold, reset_seconds):
+        self.failure_threshold = failure_threshold
+        self.reset_seconds = reset_seconds
+        self.failures = 0
+        self.opened_at = None
+        self.lock = threading.Lock()
+    
+    def allow_request(self):
+        """Return True if a call may go through (closed, or half-open after the cool-down)"""
+        with self.lock:
+            if self.opened_at is None:
+                return True
+            return time.monotonic() - self.opened_at >= self.reset_seconds
+    
+    def record_success(self):
+        with self.lock:
+            self.failures = 0
+            self.opened_at = None
+    
+    def record_failure(self):
+        with self.lock:
+            self.failures += 1
+            if self.failures >= self.failure_threshold:
+                self.opened_at = time.monotonic()
+
+
+def create_http_session():
+    """Create a pooled keep-alive HTTP session that retries transient failures with backoff"""
+    retry = Retry(
+        total=app.config['GEOCODE_MAX_RETRIES'],
+        backoff_factor=app.config['GEOCODE_BACKOFF_FACTOR'],
+        status_forcelist=(429, 500, 502, 503, 504),
+        allowed_methods=frozenset(['GET']),
+        raise_on_status=False,
+        # A long Retry-After would park the request thread; the circuit breaker handles cool-down
+        respect_retry_after_header=False
+    )
+    adapter = HTTPAdapter(pool_connections=4, pool_maxsize=16, max_retries=retry)
+    session = requests.Session()
+    session.mount('https://', adapter)
+    session.mount('http://', adapter)
+    return session
+
+
+geocoding_session = create_http_session()
+geocoding_breaker = CircuitBreaker(
+    app.config['GEOCODE_BREAKER_THRESHOLD'],
+    app.config['GEOCODE_BREAKER_RESET_SECONDS']
+)
+
+
+class GeocodingUnavailable(Exception):
+    """A geocoder could not be reached, so an address may resolve if retried later"""
+
+
+def request_mapbox_geocode(full_address):
+    """Convert address to latitude and longitude using Mapbox Geocoding API.
+    
+    Returns (None, None) if Mapbox cannot resolve the address and raises
+    GeocodingUnavailable on timeouts, rate limiting, 5xx or an open circuit.
+    """
+    if not geocoding_breaker.allow_request():
+        raise GeocodingUnavailable("circuit open, skipping Mapbox request")
+    
     api_key = os.getenv('MAPBOX_ACCESS_TOKEN')
-    url = f"https://api.mapbox.com/geocoding/v5/mapbox.places/{full_address}.json"
+    url = f"{app.config['MAPBOX_GEOCODING_URL']}/{requests.utils.quote(full_address, safe='')}.json"
     params = {
         'access_token': api_key,
         'limit': 1,
         'country': 'NG'
     }
+    timeout = (app.config['GEOCODE_CONNECT_TIMEOUT'], app.config['GEOCODE_READ_TIMEOUT'])
     try:
-        response = requests.get(url, params=params)
+        response = geocoding_session.get(url, params=params, timeout=timeout)
+    except requests.RequestException as e:
+        geocoding_breaker.record_failure()
+        raise GeocodingUnavailable(str(e))
+    
+    # Only upstream failures count towards the breaker; other 4xx mean a bad request or token
+    if response.status_code >= 500:
+        geocoding_breaker.record_failure()
+        raise GeocodingUnavailable(f"Mapbox returned {response.status_code}")
+    geocoding_breaker.record_success()
+    if response.status_code == 429:
+        raise GeocodingUnavailable("Mapbox rate limit exceeded")
+    
+    try:
+        response.raise_for_status()
         data = response.json()
         if data['features']:
             coordinates = data['features'][0]['geometry']['coordinates']
@@ -194,19 +765,817 @@ def geocode_address(address, city, zip_code):
         return None, None
 
 
-def calculate_distance(lat1, lon1, lat2, lon2):
+class GeocoderBackend:
+    """Interface for geocoding backends used by geocode_address"""
+    
+    name = None
+    cacheable = False  # whether results should be stored in the geocode cache
+    
+    def geocode(self, address, city, zip_code):
+        """Return (lat, lng) for an address, or (None, None) if it cannot be resolved.
+        
+        Raise GeocodingUnavailable when the backend itself failed.
+        """
+        raise NotImplementedError
+
+
+class MapboxGeocoder(GeocoderBackend):
+    """Resolves addresses through the Mapbox Geocoding API"""
+    
+    name = 'mapbox'
+    cacheable = True
+    
+    def geocode(self, address, city, zip_code):
+        return request_mapbox_geocode(f"{address}, {city}, {zip_code}")
+
+
+class OfflineGeocoder(GeocoderBackend):
+    """Resolves addresses from a local gazetteer loaded into memory.
+    
+    The gazetteer is a CSV file or a SQLite file with a `gazetteer` table,
+    both with address, city, zip_code, latitude and longitude columns. Rows
+    with an empty address act as postcode centroids for that city and zip.
+    """
+    
+    name = 'offline'
+    
+    def __init__(self, path):
+        self.path = path
+        self.entries = None
+        self.lock = threading.Lock()
+    
+    def load_rows(self):
+        if self.path.endswith('.csv'):
+            with open(self.path, newline='', encoding='utf-8') as f:
+                return list(csv.DictReader(f))
+        
+        connection = sqlite3.connect(f'file:{self.path}?mode=ro', uri=True)
+        connection.row_factory = sqlite3.Row
+        try:
+            return connection.execute(
+                "SELECT address, city, zip_code, latitude, longitude FROM gazetteer"
+            ).fetchall()
+        finally:
+            connection.close()
+    
+    def load(self):
+        with self.lock:
+            if self.entries is None:
+                entries = {}
+                try:
+                    for row in self.load_rows():
+                        key = normalize_address(row['address'], row['city'], row['zip_code'])
+                        entries[key] = (float(row['latitude']), float(row['longitude']))
+                except (OSError, KeyError, ValueError, sqlite3.Error) as e:
+                    print(f"Gazetteer error: {e}")
+                self.entries = entries
+        return self.entries
+    
+    def geocode(self, address, city, zip_code):
+        entries = self.entries if self.entries is not None else self.load()
+        location = (
+            entries.get(normalize_address(address, city, zip_code)) or
+            entries.get(normalize_address('', city, zip_code))
+        )
+        return location or (None, None)
+
+
+def create_geocoder_backends():
+    """Build the configured geocoder backends in the order they should be tried"""
+    backends = []
+    for name in app.config['GEOCODER_BACKENDS'].split(','):
+        name = name.strip()
+        if name == 'offline':
+            if app.config['GAZETTEER_PATH']:
+                backends.append(OfflineGeocoder(app.config['GAZETTEER_PATH']))
+        elif name == 'mapbox':
+            backends.append(MapboxGeocoder())
+        elif name:
+            raise ValueError(f"Unknown geocoder backend: {name}")
+    return backends
+
+
+geocoder_backends = create_geocoder_backends()
+
+
+def geocode_address(address, city, zip_code, raise_unavailable=False):
+    """Convert address to latitude and longitude using the configured geocoder backends.
+    
+    Returns (None, None) if no backend resolves the address. With
+    raise_unavailable, raises GeocodingUnavailable instead when a backend
+    that might have resolved it could not be reached.
+    """
+    address_key = normalize_address(address, city, zip_code)
+    cache_checked = False
+    unavailable = None
+    
+    for backend in geocoder_backends:
+        if backend.cacheable and not cache_checked:
+            cache_checked = True
+            cached = get_cached_geocode(address_key)
+            if cached:
+                return cached
+        
+        try:
+            lat, lng = backend.geocode(address, city, zip_code)
+        except GeocodingUnavailable as e:
+            print(f"Geocoding error: {backend.name}: {e}")
+            unavailable = e
+            continue
+        if lat is not None and lng is not None:
+            if backend.cacheable:
+                store_cached_geocode(address_key, lat, lng)
+            return lat, lng
+    
+    if unavailable and raise_unavailable:
+        raise unavailable
+    return None, None
+
+
+geocode_executor = ThreadPoolExecutor(max_workers=app.config['GEOCODE_WORKERS'], thread_name_prefix='geocode')
+
+
+def resolve_job_location(job_id):
+    """Geocode a pending job posting and publish it once its location is verified.
+    
+    Returns False if the geocoder could not be reached; the job then stays
+    pending so it can be retried.
+    """
+    job = db.session.get(JobPosting, job_id)
+    if job is None or job.status != 'pending_geocode':
+        return True
+    
+    try:
+        lat, lng = geocode_address(job.street_address, job.city, job.zip_code, raise_unavailable=True)
+    except GeocodingUnavailable:
+        db.session.rollback()
+        return False
+    
+    if not lat or not lng:
+        job.status = 'geocode_failed'
+    elif not is_within_service_area(lat, lng):
+        job.status = 'outside_service_area'
+    else:
+        job.latitude = lat
+        job.longitude = lng
+        job.status = 'active'
+    
+    db.session.commit()
+    return True
+
+
+def resolve_job_location_in_background(job_id, attempt=0):
+    """Worker entry point for resolve_job_location, retrying with backoff while the geocoder is unreachable"""
+    with app.app_context():
+        try:
+            resolved = resolve_job_location(job_id)
+        except Exception as e:
+            db.session.rollback()
+            print(f"Background geocoding error: {e}")
+            return
+    
+    if resolved:
+        return
+    if attempt >= app.config['GEOCODE_RETRY_LIMIT']:
+        print(f"Background geocoding error: job {job_id} left pending after {attempt} retries")
+        return
+    
+    delay = app.config['GEOCODE_RETRY_BACKOFF_SECONDS'] * 2 ** attempt
+    timer = threading.Timer(delay, geocode_executor.submit, args=(resolve_job_location_in_background, job_id, attempt + 1))
+    timer.daemon = True
+    timer.start()
+
+
+def insert_if_absent(model, values, conflict_columns):
+    """Insert a row unless one with the same unique key exists, in a single statement.
+    
+    Returns True if the row was inserted. conflict_columns must be covered by
+    a unique constraint on the model's table.
+    """
+    table = model.__table__
+    dialect = db.engine.dialect.name
+    
+    if dialect in ('sqlite', 'postgresql'):
+        insert = sqlite_insert if dialect == 'sqlite' else postgresql_insert
+        statement = insert(table).values(**values).on_conflict_do_nothing(index_elements=conflict_columns)
+        return db.session.execute(statement).rowcount == 1
+    
+    try:
+        with db.session.begin_nested():
+            db.session.execute(table.insert().values(**values))
+    except exc.IntegrityError:
+        return False
+    return True
+
+
+def adjust_application_counters(job_id, old_status, new_status):
+    """Update a job's application counters in the current transaction.
+    
+    Pass old_status=None for a newly submitted application. Counters are
+    incremented in SQL so concurrent requests don't lose updates.
+    """
+    if old_status == new_status:
+        return
+    
+    values = {JobPosting.updated_at: JobPosting.updated_at}
+    if old_status is None:
+        values[JobPosting.application_count] = JobPosting.application_count + 1
+    elif old_status in APPLICATION_STATUSES:
+        counter = getattr(JobPosting, f'{old_status}_count')
+        values[counter] = counter - 1
+    counter = getattr(JobPosting, f'{new_status}_count')
+    values[counter] = counter + 1
+    
+    db.session.execute(db.update(JobPosting).where(JobPosting.id == job_id).values(values))
+
+
+def repair_application_counters():
+    """Recompute every job's application counters from the applications table"""
+    counts = defaultdict(dict)
+    rows = db.session.query(
+        Application.job_id,
+        Application.status,
+        db.func.count(Application.id)
+    ).group_by(Application.job_id, Application.status).all()
+    for job_id, status, count in rows:
+        counts[job_id][status] = count
+    
+    job_ids = [job_id for job_id, in db.session.query(JobPosting.id).all()]
+    for job_id in job_ids:
+        job_counts = counts.get(job_id, {})
+        values = {
+            'application_count': sum(job_counts.values()),
+            'updated_at': JobPosting.updated_at
+        }
+        for status in APPLICATION_STATUSES:
+            values[f'{status}_count'] = job_counts.get(status, 0)
+        db.session.execute(db.update(JobPosting).where(JobPosting.id == job_id).values(values))
+    
+    db.session.commit()
+    return len(job_ids)
+
+
+def adjust_analytics_rollup(employer_id, status, submitted_at, updated_at, delta):
+    """Add (delta=1) or remove (delta=-1) an application from its employer's analytics rollup.
+    
+    Takes the application's status and timestamps. Call with -1 before
+    changing an application's status and with +1 after, in the same
+    transaction as the application write.
+    """
+    table = AnalyticsRollup.__table__
+    month = submitted_at.strftime('%Y-%m')
+    days = delta * (updated_at - submitted_at).days
+    key = {'employer_id': employer_id, 'month': month, 'status': status}
+    dialect = db.engine.dialect.name
+    
+    if dialect in ('sqlite', 'postgresql'):
+        insert = sqlite_insert if dialect == 'sqlite' else postgresql_insert
+        statement = insert(table).values(application_count=delta, response_days=days, **key)
+        statement = statement.on_conflict_do_update(
+            index_elements=['employer_id', 'month', 'status'],
+            set_={
+                'application_count': table.c.application_count + statement.excluded.application_count,
+                'response_days': table.c.response_days + statement.excluded.response_days
+            }
+        )
+        db.session.execute(statement)
+        return
+    
+    result = db.session.execute(db.update(table).filter_by(**key).values(
+        application_count=table.c.application_count + delta,
+        response_days=table.c.response_days + days
+    ))
+    if result.rowcount == 0:
+        db.session.execute(db.insert(table).values(application_count=delta, response_days=days, **key))
+
+
+def rebuild_analytics_rollups():
+    """Recompute every analytics rollup row from the applications table"""
+    month = month_bucket(Application.submitted_at)
+    rows = db.session.query(
+        JobPosting.employer_id,
+        month,
+        Application.status,
+        db.func.count(Application.id),
+        db.func.sum(elapsed_days(Application.submitted_at, Application.updated_at))
+    ).join(JobPosting).group_by(JobPosting.employer_id, month, Application.status).all()
+    
+    AnalyticsRollup.query.delete()
+    for employer_id, bucket, status, count, days in rows:
+        db.session.add(AnalyticsRollup(
+            employer_id=employer_id,
+            month=bucket,
+            status=status,
+            application_count=count,
+            response_days=int(days or 0)
+        ))
+    
+    db.session.commit()
+    return len(rows)
+
+
+def calculate_distances(lat, lng, lats, lngs, mode=None):
+    """Calculate distances in kilometers from one point to arrays of points.
+    
+    Uses a vectorized haversine by default; set DISTANCE_MODE (or pass
+    mode='geodesic') for exact ellipsoidal distances.
+    """
+    mode = mode or app.config['DISTANCE_MODE']
+    if mode not in DISTANCE_MODES:
+        raise ValueError(f"Unknown distance mode: {mode}")
+    
+    lats = np.asarray(lats, dtype=float)
+    lngs = np.asarray(lngs, dtype=float)
+    
+    if mode == 'geodesic':
+        return np.array([
+            geodesic((lat, lng), (lat2, lng2)).km
+            for lat2, lng2 in zip(lats, lngs)
+        ], dtype=float)
+    
+    lat1 = math.radians(lat)
+    lat2 = np.radians(lats)
+    dlat = lat2 - lat1
+    dlng = np.radians(lngs - lng)
+    a = np.sin(dlat / 2) ** 2 + math.cos(lat1) * np.cos(lat2) * np.sin(dlng / 2) ** 2
+    return 2 * EARTH_RADIUS_KM * np.arcsin(np.sqrt(np.clip(a, 0.0, 1.0)))
+
+
+def calculate_distance(lat1, lon1, lat2, lon2, mode=None):
     """Calculate distance between two points in kilometers"""
-    return geodesic((lat1, lon1), (lat2, lon2)).km
+    return float(calculate_distances(lat1, lon1, [lat2], [lon2], mode)[0])
+
+
+class DistanceCache:
+    """LRU cache of seeker-to-job distances, keyed by seeker location and job id.
+    
+    Entries remember the job coordinates they were computed for, so a job
+    whose location changed is recomputed even if another process moved it.
+    Seeker locations are evicted least recently used first once the total
+    number of cached distances exceeds max_entries. Only geodesic distances
+    are cached: the per-job lookups cost more than one vectorized haversine.
+    """
+    
+    def __init__(self, max_entries):
+        self.max_entries = max_entries
+        self.locations = OrderedDict()
+        self.size = 0
+        self.lock = threading.Lock()
+    
+    def location_key(self, lat, lng):
+        return f"{lat:.6f},{lng:.6f}|{app.config['DISTANCE_MODE']}"
+    
+    def distances(self, lat, lng, job_ids, lats, lngs):
+        """Return distances from (lat, lng) to each job, computing only uncached ones"""
+        lats = np.asarray(lats, dtype=float)
+        lngs = np.asarray(lngs, dtype=float)
+        if not self.max_entries or app.config['DISTANCE_MODE'] != 'geodesic':
+            return calculate_distances(lat, lng, lats, lngs)
+        
+        key = self.location_key(lat, lng)
+        with self.lock:
+            entry = self.locations.get(key)
+            if entry is None:
+                entry = self.locations[key] = {}
+            else:
+                self.locations.move_to_end(key)
+            cached = [entry.get(job_id) for job_id in job_ids]
+        
+        result = np.empty(len(job_ids), dtype=float)
+        missing = []
+        for index, item in enumerate(cached):
+            if item is not None and item[0] == lats[index] and item[1] == lngs[index]:
+                result[index] = item[2]
+            else:
+                missing.append(index)
+        
+        if missing:
+            missing = np.array(missing)
+            result[missing] = calculate_distances(lat, lng, lats[missing], lngs[missing])
+            with self.lock:
+                if self.locations.get(key) is entry:
+                    size_before = len(entry)
+                    for index in missing:
+                        entry[job_ids[index]] = (float(lats[index]), float(lngs[index]), float(result[index]))
+                    self.size += len(entry) - size_before
+                    self.evict()
+        
+        return result
+    
+    def evict(self):
+        while self.size > self.max_entries and self.locations:
+            _, entry = self.locations.popitem(last=False)
+            self.size -= len(entry)
+    
+    def invalidate_location(self, lat, lng):
+        """Drop every cached distance for a seeker location"""
+        if lat is None or lng is None:
+            return
+        with self.lock:
+            entry = self.locations.pop(self.location_key(lat, lng), None)
+            if entry:
+                self.size -= len(entry)
+    
+    def invalidate_job(self, job_id):
+        """Drop every cached distance to a job"""
+        with self.lock:
+            for entry in self.locations.values():
+                if entry.pop(job_id, None) is not None:
+                    self.size -= 1
+
+
+distance_cache = DistanceCache(app.config['DISTANCE_CACHE_MAX_ENTRIES'])
+
+
+class UserCache:
+    """Short-lived cache of users-table rows for the Flask-Login user loader.
+    
+    Holds plain column values rather than ORM objects, so entries can be
+    shared between requests and threads. Each process has its own cache;
+    edits made through another worker become visible after ttl seconds.
+    """
+    
+    def __init__(self, ttl, max_entries):
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self.entries = OrderedDict()
+        self.lock = threading.Lock()
+    
+    def get(self, user_id):
+        if not self.ttl:
+            return None
+        with self.lock:
+            entry = self.entries.get(user_id)
+            if entry is None:
+                return None
+            expires_at, values = entry
+            if expires_at <= time.monotonic():
+                del self.entries[user_id]
+                return None
+            self.entries.move_to_end(user_id)
+            return values
+    
+    def store(self, user):
+        if not self.ttl:
+            return
+        values = {attr.key: getattr(user, attr.key) for attr in inspect(User).column_attrs}
+        with self.lock:
+            self.entries[user.id] = (time.monotonic() + self.ttl, values)
+            self.entries.move_to_end(user.id)
+            while len(self.entries) > self.max_entries:
+                self.entries.popitem(last=False)
+    
+    def invalidate(self, user_id):
+        with self.lock:
+            self.entries.pop(user_id, None)
+
+
+user_cache = UserCache(app.config['USER_CACHE_TTL_SECONDS'], app.config['USER_CACHE_MAX_ENTRIES'])
+
+
+# Defaults Werkzeug fills in for a bare method name (Werkzeug 3.0)
+PASSWORD_HASH_DEFAULTS = {'scrypt': ['32768', '8', '1'], 'pbkdf2': ['sha256', '600000']}
+
+
+def canonical_hash_method(method):
+    """Expand a hash method such as 'pbkdf2' to the full prefix Werkzeug stores, e.g. 'pbkdf2:sha256:600000'"""
+    name, *params = method.split(':')
+    defaults = PASSWORD_HASH_DEFAULTS.get(name)
+    if defaults is None:
+        return method
+    return ':'.join([name] + params + defaults[len(params):])
+
+
+def password_needs_rehash(password_hash):
+    """True if a stored hash was made with other parameters than PASSWORD_HASH_METHOD"""
+    stored_method = password_hash.split('$', 1)[0]
+    return stored_method != canonical_hash_method(app.config['PASSWORD_HASH_METHOD'])
+
+
+password_executor = ThreadPoolExecutor(max_workers=app.config['PASSWORD_HASH_WORKERS'], thread_name_prefix='password')
+password_slots = threading.BoundedSemaphore(app.config['PASSWORD_HASH_WORKERS'] + app.config['PASSWORD_HASH_QUEUE'])
+
+
+def run_password_task(func, *args, **kwargs):
+    """Run a password hashing function on the bounded hashing pool.
+    
+    Caps the CPU spent on slow hashes so a burst of logins can't starve other
+    requests. Returns None without running func if the pool and its queue stay
+    full for PASSWORD_HASH_QUEUE_TIMEOUT seconds.
+    """
+    if not password_slots.acquire(timeout=app.config['PASSWORD_HASH_QUEUE_TIMEOUT']):
+        return None
+    try:
+        return password_executor.submit(func, *args, **kwargs).result()
+    finally:
+        password_slots.release()
+
+
+def points_in_ring(ring, lats, lngs):
+    """Vectorized even-odd ray casting test of points against a (lng, lat) polygon ring"""
+    inside = np.zeros(lats.shape, dtype=bool)
+    xs, ys = ring[:, 0], ring[:, 1]
+    
+    for x1, y1, x2, y2 in zip(xs, ys, np.roll(xs, -1), np.roll(ys, -1)):
+        crosses = (y1 > lats) != (y2 > lats)
+        with np.errstate(divide='ignore', invalid='ignore'):
+            edge_lngs = (x2 - x1) * (lats - y1) / (y2 - y1) + x1
+            inside ^= crosses & (lngs < edge_lngs)
+    
+    return inside
+
+
+class CircleZone:
+    """Service zone covering a radius around a center point"""
+    
+    def __init__(self, name, lat, lng, radius_km):
+        self.name = name
+        self.lat = lat
+        self.lng = lng
+        self.radius_km = radius_km
+        self.mode = app.config['DISTANCE_MODE']
+        # Grid cells outside these bounds never test the zone, so they must enclose the whole circle
+        self.bounds = bounding_box(lat, lng, radius_km, self.mode)
+    
+    def contains(self, lats, lngs):
+        return calculate_distances(self.lat, self.lng, lats, lngs, self.mode) <= self.radius_km
+
+
+class PolygonZone:
+    """Service zone bounded by one or more GeoJSON polygons (with optional holes)"""
+    
+    def __init__(self, name, polygons):
+        self.name = name
+        self.polygons = [
+            [np.asarray(ring, dtype=float)[:, :2] for ring in polygon]
+            for polygon in polygons
+        ]
+        outer_points = np.concatenate([polygon[0] for polygon in self.polygons])
+        self.bounds = (
+            outer_points[:, 1].min(),
+            outer_points[:, 1].max(),
+            outer_points[:, 0].min(),
+            outer_points[:, 0].max()
+        )
+    
+    def contains(self, lats, lngs):
+        inside = np.zeros(lats.shape, dtype=bool)
+        for outer, *holes in self.polygons:
+            in_polygon = points_in_ring(outer, lats, lngs)
+            for hole in holes:
+                in_polygon &= ~points_in_ring(hole, lats, lngs)
+            inside |= in_polygon
+        return inside
+
+
+class ServiceAreaRegistry:
+    """In-memory set of named service zones with a grid spatial index.
+    
+    Each grid cell lists the zones whose bounding box overlaps it, so a point
+    is only tested exactly against the few zones near it.
+    """
+    
+    def __init__(self, zones, cell_degrees):
+        self.zones = zones
+        self.names = [zone.name for zone in zones]
+        self.cell_degrees = cell_degrees
+        self.grid = defaultdict(list)
+        
+        for zone_id, zone in enumerate(zones):
+            min_lat, max_lat, min_lng, max_lng = zone.bounds
+            min_row, min_col = self.cell_coordinates(min_lat, min_lng)
+            max_row, max_col = self.cell_coordinates(max_lat, max_lng)
+            for row in range(int(min_row), int(max_row) + 1):
+                for col in range(int(min_col), int(max_col) + 1):
+                    self.grid[self.cell_key(row, col)].append(zone_id)
+    
+    def cell_coordinates(self, lats, lngs):
+        rows = np.floor((np.asarray(lats, dtype=float) + 90.0) / self.cell_degrees).astype(np.int64)
+        cols = np.floor((np.asarray(lngs, dtype=float) + 180.0) / self.cell_degrees).astype(np.int64)
+        return rows, cols
+    
+    def cell_key(self, rows, cols):
+        return rows * 1000000 + cols
+    
+    def locate(self, lats, lngs):
+        """Return an array of zone indices for the points (-1 where outside every zone).
+        
+        Where zones overlap, a point gets the first containing zone in file order.
+        """
+        lats = np.asarray(lats, dtype=float)
+        lngs = np.asarray(lngs, dtype=float)
+        zone_ids = np.full(lats.shape, -1, dtype=np.int64)
+        if not len(lats):
+            return zone_ids
+        
+        cells, inverse, counts = np.unique(
+            self.cell_key(*self.cell_coordinates(lats, lngs)),
+            return_inverse=True,
+            return_counts=True
+        )
+        groups = np.split(np.argsort(inverse, kind='stable'), np.cumsum(counts)[:-1])
+        
+        for cell, points in zip(cells, groups):
+            for zone_id in self.grid.get(int(cell), []):
+                unresolved = points[zone_ids[points] == -1]
+                if not len(unresolved):
+                    break
+                hits = self.zones[zone_id].contains(lats[unresolved], lngs[unresolved])
+                zone_ids[unresolved[hits]] = zone_id
+        
+        return zone_ids
+    
+    def contains(self, lats, lngs):
+        """Return a boolean array marking which points fall inside any zone"""
+        return self.locate(lats, lngs) >= 0
+    
+    def region_names(self, lats, lngs):
+        """Return the containing zone name for each point (None where outside every zone)"""
+        return [self.names[zone_id] if zone_id >= 0 else None for zone_id in self.locate(lats, lngs)]
+
+
+def load_service_area_zones(path):
+    """Load service zones from a GeoJSON file.
+    
+    Polygon and MultiPolygon features become polygon zones; Point features
+    with a `radius_km` property become circular zones. Earlier features take
+    precedence where zones overlap.
+    """
+    with open(path, encoding='utf-8') as f:
+        data = json.load(f)
+    
+    features = data['features'] if data.get('type') == 'FeatureCollection' else [data]
+    zones = []
+    for index, feature in enumerate(features, start=1):
+        properties = feature.get('properties') or {}
+        name = properties.get('name') or f'zone-{index}'
+        geometry = feature['geometry']
+        
+        if geometry['type'] == 'Polygon':
+            zones.append(PolygonZone(name, [geometry['coordinates']]))
+        elif geometry['type'] == 'MultiPolygon':
+            zones.append(PolygonZone(name, geometry['coordinates']))
+        elif geometry['type'] == 'Point' and 'radius_km' in properties:
+            lng, lat = geometry['coordinates'][:2]
+            zones.append(CircleZone(name, lat, lng, float(properties['radius_km'])))
+        else:
+            raise ValueError(f"Unsupported service area geometry in {name}: {geometry['type']}")
+    
+    return zones
+
+
+def load_service_areas():
+    """Build the service area registry once from SERVICE_AREAS_PATH.
+    
+    Without a zones file, the service area is the single circle described
+    by the SERVICE_AREA_* variables.
+    """
+    zones = []
+    if app.config['SERVICE_AREAS_PATH']:
+        zones.extend(load_service_area_zones(app.config['SERVICE_AREAS_PATH']))
+    
+    if not zones:
+        zones.append(CircleZone(
+            'default',
+            float(os.getenv('SERVICE_AREA_CENTER_LAT', 0)),
+            float(os.getenv('SERVICE_AREA_CENTER_LNG', 0)),
+            float(os.getenv('SERVICE_AREA_RADIUS_KM', 50))
+        ))
+    
+    return ServiceAreaRegistry(zones, app.config['SERVICE_AREA_GRID_DEGREES'])
+
+
+service_areas = load_service_areas()
+
+
+def locate_service_area(lat, lng):
+    """Return the name of the service zone containing a location, or None"""
+    return service_areas.region_names([lat], [lng])[0]
 
 
 def is_within_service_area(lat, lng):
     """Check if location is within defined service area"""
-    center_lat = float(os.getenv('SERVICE_AREA_CENTER_LAT', 0))
-    center_lng = float(os.getenv('SERVICE_AREA_CENTER_LNG', 0))
-    max_radius = float(os.getenv('SERVICE_AREA_RADIUS_KM', 50))
+    return locate_service_area(lat, lng) is not None
+
+
+JOB_IMPORT_FIELDS = (
+    'title', 'description', 'category', 'employment_type',
+    'salary_min', 'salary_max', 'street_address', 'city', 'zip_code'
+)
+JOB_IMPORT_REQUIRED_FIELDS = ('title', 'description', 'category', 'street_address', 'city', 'zip_code')
+
+
+def read_job_import_rows(file, filename):
+    """Parse an uploaded CSV or JSON job import file into a list of row dicts"""
+    text = file.read()
+    if isinstance(text, bytes):
+        text = text.decode('utf-8-sig')
     
-    distance = calculate_distance(center_lat, center_lng, lat, lng)
-    return distance <= max_radius
+    if filename.lower().endswith('.json'):
+        rows = json.loads(text)
+        if not isinstance(rows, list) or not all(isinstance(row, dict) for row in rows):
+            raise ValueError('JSON imports must be a list of job objects')
+        return rows
+    
+    return list(csv.DictReader(io.StringIO(text)))
+
+
+def validate_job_import_row(row):
+    """Return (fields, error) for one import row, with salaries parsed to floats"""
+    fields = {field: str(row.get(field) or '').strip() for field in JOB_IMPORT_FIELDS}
+    
+    missing = [field for field in JOB_IMPORT_REQUIRED_FIELDS if not fields[field]]
+    if missing:
+        return None, f"missing {', '.join(missing)}"
+    
+    # Postgres rejects over-long values, which would abort the whole import transaction
+    for field in JOB_IMPORT_FIELDS:
+        max_length = getattr(JobPosting.__table__.columns[field].type, 'length', None)
+        if max_length and len(fields[field]) > max_length:
+            return None, f"{field} must be at most {max_length} characters"
+    
+    for field in ('salary_min', 'salary_max'):
+        try:
+            fields[field] = float(fields[field]) if fields[field] else None
+        except ValueError:
+            return None, f"{field} must be a number"
+    
+    fields['employment_type'] = fields['employment_type'] or None
+    return fields, None
+
+
+def geocode_addresses(addresses):
+    """Geocode (address, city, zip_code) tuples concurrently, once per distinct address.
+    
+    Returns a dict of normalized address -> (lat, lng).
+    """
+    unique_addresses = {normalize_address(*parts): parts for parts in addresses}
+    
+    def geocode_in_app_context(parts):
+        with app.app_context():
+            return geocode_address(*parts)
+    
+    with ThreadPoolExecutor(max_workers=app.config['GEOCODE_WORKERS']) as pool:
+        locations = pool.map(geocode_in_app_context, unique_addresses.values())
+        return dict(zip(unique_addresses, locations))
+
+
+def bulk_import_jobs(employer_id, rows):
+    """Validate, geocode and insert job postings in a single transaction.
+    
+    Invalid rows are skipped. Returns (created_count, errors).
+    """
+    if len(rows) > app.config['JOB_IMPORT_MAX_ROWS']:
+        return 0, [f"Imports are limited to {app.config['JOB_IMPORT_MAX_ROWS']} rows"]
+    
+    errors = []
+    valid_rows = []
+    for row_number, row in enumerate(rows, start=1):
+        fields, error = validate_job_import_row(row)
+        if error:
+            errors.append(f"Row {row_number}: {error}")
+        else:
+            valid_rows.append((row_number, fields))
+    
+    locations = geocode_addresses([
+        (fields['street_address'], fields['city'], fields['zip_code'])
+        for _, fields in valid_rows
+    ])
+    
+    located_rows = []
+    for row_number, fields in valid_rows:
+        lat, lng = locations[normalize_address(fields['street_address'], fields['city'], fields['zip_code'])]
+        if not lat or not lng:
+            errors.append(f"Row {row_number}: could not verify address")
+        else:
+            located_rows.append((row_number, fields, lat, lng))
+    
+    regions = service_areas.region_names(
+        [lat for _, _, lat, _ in located_rows],
+        [lng for _, _, _, lng in located_rows]
+    )
+    
+    # bulk_insert_mappings skips ORM events, so the geohash and region are set here
+    mappings = []
+    for (row_number, fields, lat, lng), region in zip(located_rows, regions):
+        if region is None:
+            errors.append(f"Row {row_number}: location is outside our service area")
+            continue
+        mappings.append(dict(
+            fields,
+            employer_id=employer_id,
+            latitude=lat,
+            longitude=lng,
+            geohash=encode_geohash(lat, lng),
+            region=region,
+            status='active'
+        ))
+    
+    if mappings:
+        db.session.bulk_insert_mappings(JobPosting, mappings)
+        db.session.commit()
+    
+    return len(mappings), errors
 
 
 # ============================================================================
@@ -295,11 +1664,25 @@ def login():
         password = request.form.get('password')
         
         user = User.query.filter_by(email=email).first()
+        verified = run_password_task(check_password_hash, user.password_hash, password) if user else False
         
-        if user and user.check_password(password):
+        if verified is None:
+            flash('Too many sign-in attempts right now. Please try again in a moment.', 'warning')
+            return render_template('login.html'), 503
+        
+        if verified:
             login_user(user)
             user.last_login = datetime.utcnow()
+            
+            # Upgrade hashes made with older parameters while the plaintext is at hand
+            if password_needs_rehash(user.password_hash):
+                new_hash = run_password_task(generate_password_hash, password, method=app.config['PASSWORD_HASH_METHOD'])
+                if new_hash:
+                    user.password_hash = new_hash
+            
             db.session.commit()
+            user_cache.invalidate(user.id)
+            remember_principal(user)
             
             if user.role == 'employer':
                 return redirect(url_for('employer_dashboard'))
@@ -315,6 +1698,7 @@ def login():
 @login_required
 def logout():
     logout_user()
+    session.pop('principal', None)
     flash('You have been logged out.', 'success')
     return redirect(url_for('index'))
 
@@ -347,40 +1731,67 @@ def search_jobs():
     keyword = request.args.get('keyword', '')
     category = request.args.get('category', '')
     radius = float(request.args.get('radius', 25))
-    
-    query = JobPosting.query.filter_by(status='active')
-    
-    if keyword:
-        query = query.filter(
-            db.or_(
-                JobPosting.title.ilike(f'%{keyword}%'),
-                JobPosting.description.ilike(f'%{keyword}%')
-            )
-        )
-    
-    if category:
-        query = query.filter_by(category=category)
-    
-    jobs = query.all()
-    
-    jobs_with_distance = []
-    for job in jobs:
-        distance = calculate_distance(
-            current_user.latitude,
-            current_user.longitude,
-            job.latitude,
-            job.longitude
-        )
-        
-        if distance <= radius:
-            jobs_with_distance.append({
-                'job': job,
-                'distance': round(distance, 2)
-            })
-    
-    jobs_with_distance.sort(key=lambda x: x['distance'])
-    
-    return render_template('search_jobs.html', jobs_with_distance=jobs_with_distance, keyword=keyword, category=category, radius=radius)
+    region = request.args.get('region', '')
+    if region not in service_areas.names:
+        region = ''
+    after = request.args.get('after', '')
+    per_page = request.args.get('per_page', app.config['SEARCH_PAGE_SIZE'], type=int)
+    per_page = min(max(per_page, 1), app.config['SEARCH_MAX_PAGE_SIZE'])
+    
+    query = search_candidates_query(current_user.latitude, current_user.longitude, radius, keyword, category, region)
+    candidates = query.all()
+    
+    distances = distance_cache.distances(
+        current_user.latitude,
+        current_user.longitude,
+        [candidate.id for candidate in candidates],
+        [candidate.latitude for candidate in candidates],
+        [candidate.longitude for candidate in candidates]
+    )
+    
+    # Nearest first; equally distant jobs are ordered by keyword relevance
+    sort_keys = sorted(
+        (float(distance), float(candidate.rank), candidate.id)
+        for candidate, distance in zip(candidates, distances)
+        if distance <= radius
+    )
+    
+    # Cursor-stable pagination over the in-memory ranking: every page still ranks all
+    # candidates in the bounding box, then resumes strictly after the last job of the
+    # previous page so postings added or removed between pages don't shift results.
+    # Only the page's full rows are loaded from the database.
+    start = 0
+    cursor = decode_search_cursor(after)
+    if cursor:
+        start = bisect.bisect_right(sort_keys, cursor)
+    page_keys = sort_keys[start:start + per_page]
+    next_cursor = encode_search_cursor(page_keys[-1]) if start + per_page < len(sort_keys) else None
+    
+    jobs = JobPosting.query.options(
+        db.joinedload(JobPosting.employer)
+    ).filter(JobPosting.id.in_([job_id for _, _, job_id in page_keys])).all()
+    jobs_by_id = {job.id: job for job in jobs}
+    
+    jobs_with_distance = [
+        {
+            'job': jobs_by_id[job_id],
+            'distance': round(distance, 2),
+            'rank': rank
+        }
+        for distance, rank, job_id in page_keys
+    ]
+    
+    return render_template('search_jobs.html',
+                         jobs_with_distance=jobs_with_distance,
+                         total_results=len(sort_keys),
+                         next_cursor=next_cursor,
+                         after=after,
+                         per_page=per_page,
+                         keyword=keyword,
+                         category=category,
+                         radius=radius,
+                         region=region,
+                         regions=service_areas.names)
 
 
 @app.route('/jobs/<int:job_id>')
@@ -389,13 +1800,14 @@ def view_job(job_id):
     job = JobPosting.query.get_or_404(job_id)
     
     distance = None
-    if current_user.role == 'job_seeker':
-        distance = round(calculate_distance(
+    if current_user.role == 'job_seeker' and job.latitude is not None:
+        distance = round(float(distance_cache.distances(
             current_user.latitude,
             current_user.longitude,
-            job.latitude,
-            job.longitude
-        ), 2)
+            [job.id],
+            [job.latitude],
+            [job.longitude]
+        )[0]), 2)
     
     already_applied = Application.query.filter_by(
         job_id=job_id,
@@ -419,32 +1831,43 @@ def apply_job(job_id):
     
     job = JobPosting.query.get_or_404(job_id)
     
-    existing_application = Application.query.filter_by(
-        job_id=job_id,
-        applicant_id=current_user.id
-    ).first()
-    
-    if existing_application:
-        flash('You have already applied to this job!', 'warning')
-        return redirect(url_for('view_job', job_id=job_id))
-    
     if request.method == 'POST':
         resume_id = request.form.get('resume_id')
         cover_letter = request.form.get('cover_letter')
         
-        application = Application(
-            job_id=job_id,
-            applicant_id=current_user.id,
-            resume_id=resume_id if resume_id else None,
-            cover_letter=cover_letter
-        )
+        now = datetime.utcnow()
+        values = {
+            'job_id': job_id,
+            'applicant_id': current_user.id,
+            'resume_id': resume_id if resume_id else None,
+            'cover_letter': cover_letter,
+            'status': 'applied',
+            'submitted_at': now,
+            'updated_at': now
+        }
         
-        db.session.add(application)
+        # The unique (job_id, applicant_id) constraint rejects double submissions
+        if not insert_if_absent(Application, values, ['job_id', 'applicant_id']):
+            db.session.rollback()
+            flash('You have already applied to this job!', 'warning')
+            return redirect(url_for('view_job', job_id=job_id))
+        
+        adjust_application_counters(job_id, None, 'applied')
+        adjust_analytics_rollup(job.employer_id, 'applied', now, now, 1)
         db.session.commit()
         
         flash('Application submitted successfully!', 'success')
         return redirect(url_for('job_seeker_dashboard'))
     
+    existing_application = Application.query.filter_by(
+        job_id=job_id,
+        applicant_id=current_user.id
+    ).first()
+    
+    if existing_application:
+        flash('You have already applied to this job!', 'warning')
+        return redirect(url_for('view_job', job_id=job_id))
+    
     resumes = Resume.query.filter_by(user_id=current_user.id).all()
     return render_template('apply_job.html', job=job, resumes=resumes)
 
@@ -518,15 +1941,12 @@ def save_job(job_id):
         flash('Only job seekers can save jobs!', 'error')
         return redirect(url_for('index'))
     
-    existing = SavedJob.query.filter_by(user_id=current_user.id, job_id=job_id).first()
-    
-    if existing:
-        flash('Job already in your watch list!', 'warning')
-    else:
-        saved_job = SavedJob(user_id=current_user.id, job_id=job_id)
-        db.session.add(saved_job)
+    if insert_if_absent(SavedJob, {'user_id': current_user.id, 'job_id': job_id}, ['user_id', 'job_id']):
         db.session.commit()
         flash('Job added to watch list!', 'success')
+    else:
+        db.session.rollback()
+        flash('Job already in your watch list!', 'warning')
     
     return redirect(url_for('view_job', job_id=job_id))
 
@@ -559,13 +1979,12 @@ def employer_dashboard():
     
     jobs_with_counts = []
     for job in jobs:
-        application_count = Application.query.filter_by(job_id=job.id).count()
         jobs_with_counts.append({
             'job': job,
-            'application_count': application_count
+            'application_count': job.application_count
         })
     
-    return render_template('employer_dashboard.html', jobs_with_counts=jobs_with_counts)
+    return render_template('employer_dashboard.html', jobs_with_counts=jobs_with_counts, employer=current_profile())
 
 
 @app.route('/employer/jobs/create', methods=['GET', 'POST'])
@@ -586,16 +2005,6 @@ def create_job():
         city = request.form.get('city')
         zip_code = request.form.get('zip_code')
         
-        lat, lng = geocode_address(street_address, city, zip_code)
-        
-        if not lat or not lng:
-            flash('Could not verify address. Please check and try again.', 'error')
-            return redirect(url_for('create_job'))
-        
-        if not is_within_service_area(lat, lng):
-            flash('This location is outside our service area!', 'error')
-            return redirect(url_for('create_job'))
-        
         job = JobPosting(
             employer_id=current_user.id,
             title=title,
@@ -606,11 +2015,31 @@ def create_job():
             salary_max=float(salary_max) if salary_max else None,
             street_address=street_address,
             city=city,
-            zip_code=zip_code,
-            latitude=lat,
-            longitude=lng
+            zip_code=zip_code
         )
         
+        # Publish immediately and verify the location in the background
+        if app.config['ASYNC_GEOCODING']:
+            job.status = 'pending_geocode'
+            db.session.add(job)
+            db.session.commit()
+            geocode_executor.submit(resolve_job_location_in_background, job.id)
+            
+            flash('Job submitted! It will be published once its location is verified.', 'success')
+            return redirect(url_for('employer_dashboard'))
+        
+        lat, lng = geocode_address(street_address, city, zip_code)
+        
+        if not lat or not lng:
+            flash('Could not verify address. Please check and try again.', 'error')
+            return redirect(url_for('create_job'))
+        
+        if not is_within_service_area(lat, lng):
+            flash('This location is outside our service area!', 'error')
+            return redirect(url_for('create_job'))
+        
+        job.latitude = lat
+        job.longitude = lng
         db.session.add(job)
         db.session.commit()
         
@@ -620,6 +2049,41 @@ def create_job():
     return render_template('create_job.html')
 
 
+@app.route('/employer/jobs/import', methods=['GET', 'POST'])
+@login_required
+def import_jobs():
+    if current_user.role != 'employer':
+        flash('Access denied!', 'error')
+        return redirect(url_for('index'))
+    
+    if request.method == 'POST':
+        file = request.files.get('jobs_file')
+        
+        if not file or file.filename == '':
+            flash('No file selected!', 'error')
+            return redirect(url_for('import_jobs'))
+        
+        if file.filename.rsplit('.', 1)[-1].lower() not in JOB_IMPORT_EXTENSIONS:
+            flash('Only CSV and JSON files are allowed!', 'error')
+            return redirect(url_for('import_jobs'))
+        
+        try:
+            rows = read_job_import_rows(file, file.filename)
+        except (ValueError, csv.Error) as e:
+            flash(f'Could not read import file: {e}', 'error')
+            return redirect(url_for('import_jobs'))
+        
+        created, errors = bulk_import_jobs(current_user.id, rows)
+        
+        if created:
+            flash(f'{created} job{"s" if created != 1 else ""} imported successfully!', 'success')
+        if errors:
+            return render_template('import_jobs.html', errors=errors)
+        return redirect(url_for('employer_dashboard'))
+    
+    return render_template('import_jobs.html', errors=[])
+
+
 @app.route('/employer/jobs/<int:job_id>/edit', methods=['GET', 'POST'])
 @login_required
 def edit_job(job_id):
@@ -690,18 +2154,61 @@ def view_applications(job_id):
         flash('Access denied!', 'error')
         return redirect(url_for('employer_dashboard'))
     
-    applications = Application.query.filter_by(job_id=job_id).order_by(Application.submitted_at.desc()).all()
+    status = request.args.get('status', '')
+    if status not in APPLICATION_STATUSES:
+        status = ''
+    after = request.args.get('after', '')
+    per_page = app.config['APPLICATIONS_PAGE_SIZE']
+    
+    query = Application.query.options(
+        db.joinedload(Application.applicant)
+    ).filter_by(job_id=job_id)
+    
+    if status:
+        query = query.filter(Application.status == status)
+    
+    # Keyset pagination: newest first, resuming after the last card of the previous page
+    cursor = decode_application_cursor(after)
+    if cursor:
+        submitted_at, application_id = cursor
+        query = query.filter(db.or_(
+            Application.submitted_at < submitted_at,
+            db.and_(Application.submitted_at == submitted_at, Application.id < application_id)
+        ))
+    
+    applications = query.order_by(
+        Application.submitted_at.desc(),
+        Application.id.desc()
+    ).limit(per_page + 1).all()
+    
+    next_cursor = encode_application_cursor(applications[per_page - 1]) if len(applications) > per_page else None
+    applications = applications[:per_page]
+    
+    # Get all resumes for every applicant in a single query
+    resumes_by_applicant = defaultdict(list)
+    applicant_ids = {application.applicant_id for application in applications}
+    if applicant_ids:
+        resumes = Resume.query.filter(Resume.user_id.in_(applicant_ids)).order_by(Resume.id).all()
+        for resume in resumes:
+            resumes_by_applicant[resume.user_id].append(resume)
     
-    # Get all resumes for each applicant
     applications_with_resumes = []
     for application in applications:
-        applicant_resumes = Resume.query.filter_by(user_id=application.applicant_id).all()
         applications_with_resumes.append({
             'application': application,
-            'all_resumes': applicant_resumes
+            'all_resumes': resumes_by_applicant[application.applicant_id]
         })
     
-    return render_template('view_applications.html', job=job, applications_with_resumes=applications_with_resumes)
+    total_applications = getattr(job, f'{status}_count') if status else job.application_count
+    
+    return render_template('view_applications.html',
+                         job=job,
+                         applications_with_resumes=applications_with_resumes,
+                         total_applications=total_applications,
+                         statuses=APPLICATION_STATUSES,
+                         status=status,
+                         next_cursor=next_cursor,
+                         after=after)
 
 
 @app.route('/employer/applications/<int:application_id>/update-status', methods=['POST'])
@@ -714,8 +2221,29 @@ def update_application_status(application_id):
         return redirect(url_for('employer_dashboard'))
     
     new_status = request.form.get('status')
-    application.status = new_status
-    db.session.commit()
+    if new_status not in APPLICATION_STATUSES:
+        flash('Invalid application status!', 'error')
+        return redirect(url_for('view_applications', job_id=application.job_id))
+    
+    if new_status != application.status:
+        employer_id = application.job.employer_id
+        old_status = application.status
+        old_updated_at = application.updated_at
+        now = datetime.utcnow()
+        
+        # Conditional on the status read above, so of several concurrent submits
+        # (e.g. a double click) only one moves the application, its counters
+        # and its analytics rollup bucket
+        result = db.session.execute(
+            db.update(Application)
+            .where(Application.id == application.id, Application.status == old_status)
+            .values(status=new_status, updated_at=now)
+        )
+        if result.rowcount == 1:
+            adjust_application_counters(application.job_id, old_status, new_status)
+            adjust_analytics_rollup(employer_id, old_status, application.submitted_at, old_updated_at, -1)
+            adjust_analytics_rollup(employer_id, new_status, application.submitted_at, now, 1)
+        db.session.commit()
     
     flash('Application status updated!', 'success')
     return redirect(url_for('view_applications', job_id=application.job_id))
@@ -738,15 +2266,17 @@ def download_resume(filename):
 @app.route('/profile')
 @login_required
 def profile():
-    return render_template('profile.html')
+    return render_template('profile.html', user=current_profile())
 
 
 @app.route('/profile/edit', methods=['GET', 'POST'])
 @login_required
 def edit_profile():
+    user = current_profile()
+    
     if request.method == 'POST':
-        current_user.full_name = request.form.get('full_name')
-        current_user.phone = request.form.get('phone')
+        user.full_name = request.form.get('full_name')
+        user.phone = request.form.get('phone')
         
         # Get new address fields
         new_address = request.form.get('address')
@@ -755,9 +2285,9 @@ def edit_profile():
         
         # Check if address changed
         address_changed = (
-            new_address != current_user.address or 
-            new_city != current_user.city or 
-            new_zip != current_user.zip_code
+            new_address != user.address or 
+            new_city != user.city or 
+            new_zip != user.zip_code
         )
         
         if address_changed:
@@ -769,21 +2299,24 @@ def edit_profile():
                 return redirect(url_for('edit_profile'))
             
             # Update address and coordinates
-            current_user.address = new_address
-            current_user.city = new_city
-            current_user.zip_code = new_zip
-            current_user.latitude = lat
-            current_user.longitude = lng
+            distance_cache.invalidate_location(user.latitude, user.longitude)
+            user.address = new_address
+            user.city = new_city
+            user.zip_code = new_zip
+            user.latitude = lat
+            user.longitude = lng
         
-        if current_user.role == 'employer':
-            current_user.company_name = request.form.get('company_name')
-            current_user.company_description = request.form.get('company_description')
+        if user.role == 'employer':
+            user.company_name = request.form.get('company_name')
+            user.company_description = request.form.get('company_description')
         
         db.session.commit()
+        user_cache.invalidate(user.id)
+        remember_principal(user)
         flash('Profile updated successfully!', 'success')
         return redirect(url_for('profile'))
     
-    return render_template('edit_profile.html')
+    return render_template('edit_profile.html', user=user)
 
 
 # ============================================================================
@@ -797,58 +2330,67 @@ def analytics():
         flash('Access denied!', 'error')
         return redirect(url_for('index'))
     
-    jobs = JobPosting.query.filter_by(employer_id=current_user.id).all()
-    total_apps = Application.query.join(JobPosting).filter(JobPosting.employer_id == current_user.id).all()
-    total_applications = len(total_apps)
+    rollups = AnalyticsRollup.query.filter_by(employer_id=current_user.id).all()
     
-    accepted = len([app for app in total_apps if app.status == 'accepted'])
+    apps_by_status = defaultdict(int)
+    apps_by_month = defaultdict(int)
+    responded_days = 0
+    for rollup in rollups:
+        apps_by_status[rollup.status] += rollup.application_count
+        apps_by_month[rollup.month] += rollup.application_count
+        if rollup.status != 'applied':
+            responded_days += rollup.response_days
+    apps_by_status = {status: count for status, count in apps_by_status.items() if count}
+    total_applications = sum(apps_by_status.values())
+    
+    accepted = apps_by_status.get('accepted', 0)
     acceptance_rate = (accepted / total_applications * 100) if total_applications else 0
     
-    interviews = len([app for app in total_apps if app.status == 'interview'])
+    interviews = apps_by_status.get('interview', 0)
     interview_rate = (interviews / total_applications * 100) if total_applications else 0
     
-    rejected = len([app for app in total_apps if app.status == 'rejected'])
+    rejected = apps_by_status.get('rejected', 0)
     rejection_rate = (rejected / total_applications * 100) if total_applications else 0
     
-    responded = len([app for app in total_apps if app.status != 'applied'])
+    responded = total_applications - apps_by_status.get('applied', 0)
     response_rate = (responded / total_applications * 100) if total_applications else 0
     
-    apps_by_month = defaultdict(int)
-    apps_by_status = defaultdict(int)
-    
-    for app in total_apps:
-        month = app.submitted_at.strftime('%B %Y')
-        apps_by_month[month] += 1
-        apps_by_status[app.status] += 1
+    recent_months = sorted(
+        ((bucket, count) for bucket, count in apps_by_month.items() if count),
+        reverse=True
+    )[:6]
+    sorted_months = {
+        datetime.strptime(bucket, '%Y-%m').strftime('%B %Y'): count
+        for bucket, count in recent_months
+    }
     
-    sorted_months = dict(sorted(apps_by_month.items(), key=lambda x: datetime.strptime(x[0], '%B %Y'), reverse=True)[:6])
+    avg_response_time = responded_days / responded if responded else 0
     
-    response_times = []
-    for app in total_apps:
-        if app.status != 'applied':
-            time_diff = (app.updated_at - app.submitted_at).days
-            response_times.append(time_diff)
-    avg_response_time = sum(response_times) / len(response_times) if response_times else 0
+    employer_jobs = JobPosting.query.filter_by(employer_id=current_user.id)
     
-    job_popularity = {}
-    for job in jobs:
-        app_count = Application.query.filter_by(job_id=job.id).count()
-        job_popularity[job.title] = app_count
+    top_job = employer_jobs.with_entities(
+        JobPosting.title,
+        JobPosting.application_count
+    ).order_by(JobPosting.application_count.desc()).first()
+    most_popular_job = tuple(top_job) if top_job else ("None", 0)
     
-    most_popular_job = max(job_popularity.items(), key=lambda x: x[1]) if job_popularity else ("None", 0)
-    active_jobs = len([job for job in jobs if job.status == 'active'])
-    paused_jobs = len([job for job in jobs if job.status == 'paused'])
-    archived_jobs = len([job for job in jobs if job.status == 'archived'])
+    jobs_by_status = dict(employer_jobs.with_entities(
+        JobPosting.status,
+        db.func.count(JobPosting.id)
+    ).group_by(JobPosting.status).all())
+    active_jobs = jobs_by_status.get('active', 0)
+    paused_jobs = jobs_by_status.get('paused', 0)
+    archived_jobs = jobs_by_status.get('archived', 0)
     
     return render_template('analytics.html', 
-                         total_jobs=len(jobs),
+                         total_jobs=sum(jobs_by_status.values()),
                          total_applications=total_applications,
                          acceptance_rate=round(acceptance_rate, 1),
                          interview_rate=round(interview_rate, 1),
                          rejection_rate=round(rejection_rate, 1),
                          response_rate=round(response_rate, 1),
                          apps_by_month=sorted_months,
-                         apps_by_status=dict(apps_by_status),
+                         apps_by_status=apps_by_status,
                          avg_response_time=round(avg_response_time, 1),
                          most_popular_job=most_popular_job,
                          active_jobs=active_jobs,
@@ -856,6 +2398,109 @@ def analytics():
                          archived_jobs=archived_jobs)
 
 
+# ============================================================================
+# CLI COMMANDS
+# ============================================================================
+
+@app.cli.command('reindex-geohash')
+def reindex_geohash():
+    """Backfill the geohash spatial index for existing job postings"""
+    rows = db.session.query(
+        JobPosting.id,
+        JobPosting.latitude,
+        JobPosting.longitude,
+        JobPosting.updated_at
+    ).filter(JobPosting.latitude.isnot(None)).all()
+    
+    db.session.bulk_update_mappings(JobPosting, [
+        {'id': row.id, 'geohash': encode_geohash(row.latitude, row.longitude), 'updated_at': row.updated_at}
+        for row in rows
+    ])
+    db.session.commit()
+    print(f"Reindexed {len(rows)} job postings")
+
+
+@app.cli.command('reindex-regions')
+def reindex_regions():
+    """Reassign every job posting to its containing service zone"""
+    rows = db.session.query(
+        JobPosting.id,
+        JobPosting.latitude,
+        JobPosting.longitude,
+        JobPosting.updated_at
+    ).filter(JobPosting.latitude.isnot(None)).all()
+    regions = service_areas.region_names([row.latitude for row in rows], [row.longitude for row in rows])
+    
+    db.session.bulk_update_mappings(JobPosting, [
+        {'id': row.id, 'region': region, 'updated_at': row.updated_at}
+        for row, region in zip(rows, regions)
+    ])
+    db.session.commit()
+    print(f"Reindexed regions for {len(rows)} job postings")
+
+
+@app.cli.command('repair-application-counts')
+def repair_application_counts():
+    """Backfill the per-job application counters from the applications table"""
+    job_count = repair_application_counters()
+    print(f"Repaired application counters for {job_count} job postings")
+
+
+@app.cli.command('rebuild-analytics-rollups')
+def rebuild_analytics_rollups_command():
+    """Recompute the employer analytics rollup table from scratch"""
+    row_count = rebuild_analytics_rollups()
+    print(f"Rebuilt {row_count} analytics rollup rows")
+
+
+@app.cli.command('resolve-pending-geocodes')
+@click.option('--include-failed', is_flag=True, help="Also retry jobs marked geocode_failed")
+def resolve_pending_geocodes(include_failed):
+    """Geocode job postings left in the pending_geocode state"""
+    if include_failed:
+        db.session.execute(db.update(JobPosting).where(JobPosting.status == 'geocode_failed').values(
+            status='pending_geocode',
+            updated_at=JobPosting.updated_at
+        ))
+        db.session.commit()
+    
+    job_ids = [job_id for job_id, in db.session.query(JobPosting.id).filter_by(status='pending_geocode').all()]
+    unavailable = sum(1 for job_id in job_ids if not resolve_job_location(job_id))
+    print(f"Resolved {len(job_ids) - unavailable} pending job postings")
+    if unavailable:
+        print(f"{unavailable} left pending because the geocoder could not be reached; run again later")
+
+
+@app.cli.command('import-jobs')
+@click.argument('employer_email')
+@click.argument('path', type=click.Path(exists=True, dir_okay=False))
+def import_jobs_command(employer_email, path):
+    """Bulk import job postings from a CSV or JSON file for an employer"""
+    employer = User.query.filter_by(email=employer_email, role='employer').first()
+    if not employer:
+        print(f"No employer found with email {employer_email}")
+        return
+    
+    try:
+        with open(path, encoding='utf-8-sig') as f:
+            rows = read_job_import_rows(f, path)
+    except (ValueError, csv.Error) as e:
+        print(f"Could not read import file: {e}")
+        return
+    
+    created, errors = bulk_import_jobs(employer.id, rows)
+    for error in errors:
+        print(error)
+    print(f"Imported {created} job postings")
+
+
+@app.cli.command('rebuild-search-index')
+def rebuild_search_index():
+    """Create and repopulate the full-text index for job keyword search"""
+    init_search_index(rebuild=True)
+    print("Search index rebuilt")
+
+
 # ============================================================================
 # INITIALIZE DATABASE AND RUN APP
 # ============================================================================
@@ -863,4 +2508,5 @@ def analytics():
 if __name__ == '__main__':
     with app.app_context():
         db.create_all()
+        init_search_index()
     app.run(debug=True)
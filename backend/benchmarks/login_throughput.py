@@ -0,0 +1,112 @@
+"""
+Login throughput benchmark for the password hashing settings.
+
+For each hash method, seeds a user into a throwaway SQLite database and
+drives concurrent POST /login requests through the Flask test client, so
+verification runs on the app's bounded hashing pool exactly as in production.
+Prints the raw cost of one verification and logins per second in total and
+per core used by the pool. Only logins that redirect to a dashboard count
+towards throughput; rejected (503) and failed responses are reported separately.
+
+Usage (from backend/):
+    python benchmarks/login_throughput.py [--threads 16] [--logins 200] [METHOD ...]
+"""
+import argparse
+import os
+import sys
+import tempfile
+import threading
+import time
+
+DB_PATH = os.path.join(tempfile.mkdtemp(), 'login_throughput.db')
+os.environ['DATABASE_URL'] = f'sqlite:///{DB_PATH}'
+os.environ.setdefault('SECRET_KEY', 'benchmark')
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from werkzeug.security import check_password_hash  # noqa: E402
+
+from app import app, db, User  # noqa: E402
+
+DEFAULT_METHODS = (
+    'pbkdf2:sha256:260000',
+    'pbkdf2:sha256:600000',
+    'scrypt:16384:8:1',
+    'scrypt:32768:8:1',
+)
+PASSWORD = 'correct horse battery staple'
+
+
+def create_user(index, method):
+    """Insert a job seeker whose password is hashed with method"""
+    app.config['PASSWORD_HASH_METHOD'] = method
+    user = User(email=f'login{index}@example.com', role='job_seeker', full_name=f'Login {index}')
+    user.set_password(PASSWORD)
+    db.session.add(user)
+    db.session.commit()
+    return user
+
+
+def verify_cost(password_hash, samples=5):
+    """Mean seconds for one password verification in the calling thread"""
+    started = time.perf_counter()
+    for _ in range(samples):
+        check_password_hash(password_hash, PASSWORD)
+    return (time.perf_counter() - started) / samples
+
+
+def drive_logins(email, threads, logins):
+    """Run logins across threads; return (elapsed seconds, successes, rejections, errors)"""
+    counts = {'ok': 0, 'busy': 0, 'error': 0}
+    lock = threading.Lock()
+    per_thread = [logins // threads + (1 if i < logins % threads else 0) for i in range(threads)]
+
+    def worker(count):
+        for _ in range(count):
+            client = app.test_client()
+            response = client.post('/login', data={'email': email, 'password': PASSWORD})
+            # A successful login redirects to the dashboard; a 200 re-renders the form with an error
+            if response.status_code == 302:
+                key = 'ok'
+            elif response.status_code == 503:
+                key = 'busy'
+            else:
+                key = 'error'
+            with lock:
+                counts[key] += 1
+
+    workers = [threading.Thread(target=worker, args=(count,)) for count in per_thread]
+    started = time.perf_counter()
+    for thread in workers:
+        thread.start()
+    for thread in workers:
+        thread.join()
+    return time.perf_counter() - started, counts['ok'], counts['busy'], counts['error']
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('methods', nargs='*', default=DEFAULT_METHODS)
+    parser.add_argument('--threads', type=int, default=16, help='concurrent login clients')
+    parser.add_argument('--logins', type=int, default=200, help='logins per method')
+    args = parser.parse_args()
+
+    cores = min(app.config['PASSWORD_HASH_WORKERS'], os.cpu_count() or 1)
+    print(f"Hashing pool: {app.config['PASSWORD_HASH_WORKERS']} workers, "
+          f"queue {app.config['PASSWORD_HASH_QUEUE']}, {os.cpu_count()} CPUs; "
+          f"{args.threads} clients, {args.logins} logins per method\n")
+    print(f"{'method':<26} {'verify ms':>10} {'logins/s':>10} {'per core':>10} {'rejected':>9} {'failed':>7}")
+
+    with app.app_context():
+        db.create_all()
+        for index, method in enumerate(args.methods):
+            user = create_user(index, method)
+            cost = verify_cost(user.password_hash)
+            elapsed, ok, busy, failed = drive_logins(user.email, args.threads, args.logins)
+            rate = ok / elapsed
+            print(f'{method:<26} {cost * 1000:>10.1f} {rate:>10.1f} {rate / cores:>10.1f} {busy:>9} {failed:>7}')
+
+    print(f'\nDatabase left at {DB_PATH}')
+
+
+if __name__ == '__main__':
+    main()
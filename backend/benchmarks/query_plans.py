@@ -0,0 +1,158 @@
+"""
+Query plan benchmark for the hot-path indexes.
+
+Seeds a throwaway SQLite database, then prints EXPLAIN QUERY PLAN output and
+average timings for the queries behind search_jobs, job_seeker_dashboard,
+apply_job and view_applications -- first with the composite indexes dropped
+("before"), then with them in place ("after").
+
+Usage (from backend/):
+    python benchmarks/query_plans.py [--employers 50] [--jobs 20000] [--seekers 2000] [--radius 25]
+"""
+import argparse
+import os
+import random
+import sys
+import tempfile
+import time
+from datetime import datetime, timedelta
+
+DB_PATH = os.path.join(tempfile.mkdtemp(), 'query_plans.db')
+os.environ['DATABASE_URL'] = f'sqlite:///{DB_PATH}'
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app import (app, db, User, JobPosting, Application, Resume, SavedJob,  # noqa: E402
+                 APPLICATION_STATUSES, encode_geohash, search_candidates_query)
+
+# The (job_id, applicant_id) and (user_id, job_id) probes are backed by unique
+# constraints, which stay in place for both runs
+HOT_INDEXES = (
+    ('ix_job_postings_status_lat_lng', 'job_postings', 'status, latitude, longitude'),
+    ('ix_job_postings_employer_created', 'job_postings', 'employer_id, created_at'),
+    ('ix_applications_job_submitted', 'applications', 'job_id, submitted_at'),
+    ('ix_applications_applicant_submitted', 'applications', 'applicant_id, submitted_at'),
+    ('ix_saved_jobs_user_saved', 'saved_jobs', 'user_id, saved_at'),
+    ('ix_resumes_user_id', 'resumes', 'user_id'),
+)
+
+# (label, SQL) pairs mirroring the ORM queries issued by each route; search_jobs
+# is compiled from the route's own query builder in main()
+HOT_QUERIES = (
+    ('employer_dashboard',
+     "SELECT * FROM job_postings WHERE employer_id = :employer_id ORDER BY created_at DESC"),
+    ('job_seeker_dashboard (applications)',
+     "SELECT * FROM applications WHERE applicant_id = :seeker_id ORDER BY submitted_at DESC"),
+    ('job_seeker_dashboard (saved jobs)',
+     "SELECT * FROM saved_jobs WHERE user_id = :seeker_id ORDER BY saved_at DESC"),
+    ('apply_job (existing application)',
+     "SELECT * FROM applications WHERE job_id = :job_id AND applicant_id = :seeker_id LIMIT 1"),
+    ('apply_job (resumes)',
+     "SELECT * FROM resumes WHERE user_id = :seeker_id ORDER BY uploaded_at DESC"),
+    ('view_applications',
+     "SELECT * FROM applications WHERE job_id = :job_id "
+     "ORDER BY submitted_at DESC, id DESC LIMIT 25"),
+)
+
+
+def seed(employers, jobs, seekers):
+    """Insert a synthetic data set with realistic fan-out"""
+    rng = random.Random(42)
+    now = datetime.utcnow()
+
+    users = [
+        {'email': f'employer{i}@example.com', 'password_hash': 'x', 'role': 'employer',
+         'full_name': f'Employer {i}', 'company_name': f'Company {i}'}
+        for i in range(employers)
+    ] + [
+        {'email': f'seeker{i}@example.com', 'password_hash': 'x', 'role': 'job_seeker',
+         'full_name': f'Seeker {i}'}
+        for i in range(seekers)
+    ]
+    db.session.bulk_insert_mappings(User, users)
+
+    job_rows = []
+    for i in range(jobs):
+        lat = 42.36 + rng.uniform(-1.0, 1.0)
+        lng = -71.06 + rng.uniform(-1.0, 1.0)
+        job_rows.append({
+            'employer_id': rng.randint(1, employers),
+            'title': f'Job {i}', 'description': 'Synthetic posting', 'category': 'other',
+            'street_address': f'{i} Main St', 'city': 'Boston', 'zip_code': '02101',
+            'latitude': lat, 'longitude': lng, 'geohash': encode_geohash(lat, lng),
+            'status': rng.choice(('active', 'active', 'active', 'paused', 'closed')),
+            'created_at': now - timedelta(minutes=i),
+        })
+    db.session.bulk_insert_mappings(JobPosting, job_rows)
+
+    seeker_ids = range(employers + 1, employers + seekers + 1)
+    db.session.bulk_insert_mappings(Resume, [
+        {'user_id': uid, 'filename': f'{uid}.pdf', 'original_filename': 'resume.pdf'}
+        for uid in seeker_ids
+    ])
+    db.session.bulk_insert_mappings(Application, [
+        {'job_id': job_id, 'applicant_id': uid,
+         'status': rng.choice(APPLICATION_STATUSES),
+         'submitted_at': now - timedelta(hours=rng.randint(0, 24 * 90))}
+        for uid in seeker_ids for job_id in rng.sample(range(1, jobs + 1), 10)
+    ])
+    db.session.bulk_insert_mappings(SavedJob, [
+        {'user_id': uid, 'job_id': job_id,
+         'saved_at': now - timedelta(hours=rng.randint(0, 24 * 90))}
+        for uid in seeker_ids for job_id in rng.sample(range(1, jobs + 1), 5)
+    ])
+    db.session.commit()
+
+
+def run(label, queries, params, repeat):
+    """Print the plan and mean latency of every hot query"""
+    print(f'\n=== {label} ===')
+    with db.engine.connect() as conn:
+        conn.exec_driver_sql('ANALYZE')
+        for name, sql in queries:
+            plan = conn.execute(db.text(f'EXPLAIN QUERY PLAN {sql}'), params).fetchall()
+            started = time.perf_counter()
+            for _ in range(repeat):
+                conn.execute(db.text(sql), params).fetchall()
+            elapsed_ms = (time.perf_counter() - started) * 1000 / repeat
+            print(f'\n{name}: {elapsed_ms:.3f} ms')
+            for row in plan:
+                print(f'    {row[-1]}')
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--employers', type=int, default=50)
+    parser.add_argument('--jobs', type=int, default=20000)
+    parser.add_argument('--seekers', type=int, default=2000)
+    parser.add_argument('--repeat', type=int, default=200)
+    parser.add_argument('--radius', type=float, default=25, help='search radius in km')
+    args = parser.parse_args()
+
+    with app.app_context():
+        db.create_all()
+        seed(args.employers, args.jobs, args.seekers)
+
+        search = search_candidates_query(42.36, -71.06, args.radius).statement
+        search_sql = str(search.compile(db.engine, compile_kwargs={'literal_binds': True}))
+        queries = ((f'search_jobs ({args.radius:g} km)', search_sql),) + HOT_QUERIES
+        params = {
+            'employer_id': 1,
+            'seeker_id': args.employers + 1,
+            'job_id': db.session.scalar(db.select(Application.job_id).limit(1)),
+        }
+
+        with db.engine.begin() as conn:
+            for name, _, _ in HOT_INDEXES:
+                conn.exec_driver_sql(f'DROP INDEX IF EXISTS {name}')
+        run('before (no hot-path indexes)', queries, params, args.repeat)
+
+        with db.engine.begin() as conn:
+            for name, table, columns in HOT_INDEXES:
+                conn.exec_driver_sql(f'CREATE INDEX {name} ON {table} ({columns})')
+        run('after (hot-path indexes)', queries, params, args.repeat)
+
+    print(f'\nDatabase left at {DB_PATH}')
+
+
+if __name__ == '__main__':
+    main()
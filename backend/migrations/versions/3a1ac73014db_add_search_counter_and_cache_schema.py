@@ -0,0 +1,81 @@
+"""add search, counter and cache schema
+
+Revision ID: 3a1ac73014db
+Revises: 519bd36619f0
+Create Date: 2026-10-16 09:05:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '3a1ac73014db'
+down_revision = '519bd36619f0'
+branch_labels = None
+depends_on = None
+
+COUNTER_COLUMNS = (
+    'application_count', 'applied_count', 'under_review_count',
+    'interview_count', 'rejected_count', 'accepted_count'
+)
+
+
+def upgrade():
+    with op.batch_alter_table('job_postings', schema=None) as batch_op:
+        batch_op.alter_column('latitude', existing_type=sa.Float(), nullable=True)
+        batch_op.alter_column('longitude', existing_type=sa.Float(), nullable=True)
+        batch_op.add_column(sa.Column('geohash', sa.String(length=12), nullable=True))
+        batch_op.add_column(sa.Column('region', sa.String(length=100), nullable=True))
+        for column in COUNTER_COLUMNS:
+            batch_op.add_column(sa.Column(column, sa.Integer(), server_default='0', nullable=False))
+        batch_op.create_index('ix_job_postings_geohash', ['geohash'], unique=False)
+        batch_op.create_index('ix_job_postings_region', ['region'], unique=False)
+        batch_op.create_index('ix_job_postings_lat_lng', ['latitude', 'longitude'], unique=False)
+
+    with op.batch_alter_table('applications', schema=None) as batch_op:
+        batch_op.create_index('ix_applications_job_status_submitted', ['job_id', 'status', 'submitted_at'], unique=False)
+
+    op.create_table('analytics_rollups',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('employer_id', sa.Integer(), nullable=False),
+    sa.Column('month', sa.String(length=7), nullable=False),
+    sa.Column('status', sa.String(length=50), nullable=False),
+    sa.Column('application_count', sa.Integer(), nullable=False),
+    sa.Column('response_days', sa.Integer(), nullable=False),
+    sa.ForeignKeyConstraint(['employer_id'], ['users.id'], ),
+    sa.PrimaryKeyConstraint('id'),
+    sa.UniqueConstraint('employer_id', 'month', 'status', name='uq_analytics_rollups_employer_month_status')
+    )
+    op.create_table('geocode_cache',
+    sa.Column('address_key', sa.String(length=400), nullable=False),
+    sa.Column('latitude', sa.Float(), nullable=False),
+    sa.Column('longitude', sa.Float(), nullable=False),
+    sa.Column('created_at', sa.DateTime(), nullable=False),
+    sa.Column('last_used_at', sa.DateTime(), nullable=False),
+    sa.PrimaryKeyConstraint('address_key')
+    )
+    with op.batch_alter_table('geocode_cache', schema=None) as batch_op:
+        batch_op.create_index('ix_geocode_cache_last_used_at', ['last_used_at'], unique=False)
+
+
+def downgrade():
+    with op.batch_alter_table('geocode_cache', schema=None) as batch_op:
+        batch_op.drop_index('ix_geocode_cache_last_used_at')
+
+    op.drop_table('geocode_cache')
+    op.drop_table('analytics_rollups')
+
+    with op.batch_alter_table('applications', schema=None) as batch_op:
+        batch_op.drop_index('ix_applications_job_status_submitted')
+
+    with op.batch_alter_table('job_postings', schema=None) as batch_op:
+        batch_op.drop_index('ix_job_postings_lat_lng')
+        batch_op.drop_index('ix_job_postings_region')
+        batch_op.drop_index('ix_job_postings_geohash')
+        for column in reversed(COUNTER_COLUMNS):
+            batch_op.drop_column(column)
+        batch_op.drop_column('region')
+        batch_op.drop_column('geohash')
+        batch_op.alter_column('longitude', existing_type=sa.Float(), nullable=False)
+        batch_op.alter_column('latitude', existing_type=sa.Float(), nullable=False)
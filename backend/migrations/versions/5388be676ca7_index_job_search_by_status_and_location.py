@@ -0,0 +1,30 @@
+"""index job search by status and location
+
+Revision ID: 5388be676ca7
+Revises: 6d505e6d3ca9
+Create Date: 2026-10-17 09:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '5388be676ca7'
+down_revision = '6d505e6d3ca9'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    # search_jobs filters status = 'active' plus the radius bounding box;
+    # it no longer filters on geohash
+    with op.batch_alter_table('job_postings', schema=None) as batch_op:
+        batch_op.drop_index('ix_job_postings_status_geohash')
+        batch_op.create_index('ix_job_postings_status_lat_lng', ['status', 'latitude', 'longitude'], unique=False)
+
+
+def downgrade():
+    with op.batch_alter_table('job_postings', schema=None) as batch_op:
+        batch_op.drop_index('ix_job_postings_status_lat_lng')
+        batch_op.create_index('ix_job_postings_status_geohash', ['status', 'geohash'], unique=False)
@@ -0,0 +1,66 @@
+"""add job keyword search index
+
+Revision ID: 6d505e6d3ca9
+Revises: a98d02d644e9
+Create Date: 2026-10-16 14:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '6d505e6d3ca9'
+down_revision = 'a98d02d644e9'
+branch_labels = None
+depends_on = None
+
+# Copied from SQLITE_SEARCH_INDEX_DDL / POSTGRES_SEARCH_INDEX_DDL in app.py as of
+# this revision. On SQLite, a later migration that recreates job_postings in
+# batch mode drops these triggers and must run this DDL again.
+JOB_TSVECTOR_SQL = "to_tsvector('english', coalesce(title, '') || ' ' || coalesce(description, ''))"
+
+SQLITE_SEARCH_INDEX_DDL = [
+    """CREATE VIRTUAL TABLE IF NOT EXISTS job_postings_fts
+       USING fts5(title, description, content='job_postings', content_rowid='id')""",
+    """CREATE TRIGGER IF NOT EXISTS job_postings_fts_ai AFTER INSERT ON job_postings BEGIN
+           INSERT INTO job_postings_fts(rowid, title, description)
+           VALUES (new.id, new.title, new.description);
+       END""",
+    """CREATE TRIGGER IF NOT EXISTS job_postings_fts_ad AFTER DELETE ON job_postings BEGIN
+           INSERT INTO job_postings_fts(job_postings_fts, rowid, title, description)
+           VALUES ('delete', old.id, old.title, old.description);
+       END""",
+    """CREATE TRIGGER IF NOT EXISTS job_postings_fts_au AFTER UPDATE OF title, description ON job_postings BEGIN
+           INSERT INTO job_postings_fts(job_postings_fts, rowid, title, description)
+           VALUES ('delete', old.id, old.title, old.description);
+           INSERT INTO job_postings_fts(rowid, title, description)
+           VALUES (new.id, new.title, new.description);
+       END""",
+]
+
+POSTGRES_SEARCH_INDEX_DDL = [
+    f"CREATE INDEX IF NOT EXISTS ix_job_postings_fts ON job_postings USING GIN ({JOB_TSVECTOR_SQL})",
+]
+
+
+def upgrade():
+    dialect = op.get_bind().dialect.name
+    if dialect == 'sqlite':
+        for statement in SQLITE_SEARCH_INDEX_DDL:
+            op.execute(statement)
+        # Index postings that existed before the table (or whose triggers were dropped)
+        op.execute("INSERT INTO job_postings_fts(job_postings_fts) VALUES ('rebuild')")
+    elif dialect == 'postgresql':
+        for statement in POSTGRES_SEARCH_INDEX_DDL:
+            op.execute(statement)
+
+
+def downgrade():
+    dialect = op.get_bind().dialect.name
+    if dialect == 'sqlite':
+        for trigger in ('job_postings_fts_au', 'job_postings_fts_ad', 'job_postings_fts_ai'):
+            op.execute(f'DROP TRIGGER IF EXISTS {trigger}')
+        op.execute('DROP TABLE IF EXISTS job_postings_fts')
+    elif dialect == 'postgresql':
+        op.execute('DROP INDEX IF EXISTS ix_job_postings_fts')
@@ -0,0 +1,46 @@
+"""unique applications and saved jobs per user
+
+Revision ID: a98d02d644e9
+Revises: e69edf82e80b
+Create Date: 2026-10-16 10:30:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'a98d02d644e9'
+down_revision = 'e69edf82e80b'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    # Keep the earliest row of any duplicates left by the old check-then-insert
+    op.execute(
+        'DELETE FROM applications WHERE id NOT IN '
+        '(SELECT MIN(id) FROM applications GROUP BY job_id, applicant_id)'
+    )
+    op.execute(
+        'DELETE FROM saved_jobs WHERE id NOT IN '
+        '(SELECT MIN(id) FROM saved_jobs GROUP BY user_id, job_id)'
+    )
+
+    with op.batch_alter_table('applications', schema=None) as batch_op:
+        batch_op.drop_index('ix_applications_job_applicant')
+        batch_op.create_unique_constraint('uq_applications_job_applicant', ['job_id', 'applicant_id'])
+
+    with op.batch_alter_table('saved_jobs', schema=None) as batch_op:
+        batch_op.drop_index('ix_saved_jobs_user_job')
+        batch_op.create_unique_constraint('uq_saved_jobs_user_job', ['user_id', 'job_id'])
+
+
+def downgrade():
+    with op.batch_alter_table('saved_jobs', schema=None) as batch_op:
+        batch_op.drop_constraint('uq_saved_jobs_user_job', type_='unique')
+        batch_op.create_index('ix_saved_jobs_user_job', ['user_id', 'job_id'], unique=False)
+
+    with op.batch_alter_table('applications', schema=None) as batch_op:
+        batch_op.drop_constraint('uq_applications_job_applicant', type_='unique')
+        batch_op.create_index('ix_applications_job_applicant', ['job_id', 'applicant_id'], unique=False)
@@ -0,0 +1,61 @@
+"""add indexes for hot query predicates
+
+Revision ID: e69edf82e80b
+Revises: 3a1ac73014db
+Create Date: 2026-10-16 09:10:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'e69edf82e80b'
+down_revision = '3a1ac73014db'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    # search_jobs: status = 'active' plus a geohash prefix range
+    # employer_dashboard / analytics: employer_id, newest first
+    with op.batch_alter_table('job_postings', schema=None) as batch_op:
+        batch_op.drop_index('ix_job_postings_geohash')
+        batch_op.create_index('ix_job_postings_status_geohash', ['status', 'geohash'], unique=False)
+        batch_op.create_index('ix_job_postings_employer_created', ['employer_id', 'created_at'], unique=False)
+
+    # view_applications: job_id, newest first
+    # job_seeker_dashboard: applicant_id, newest first
+    # apply_job / view_job: existing application probe
+    with op.batch_alter_table('applications', schema=None) as batch_op:
+        batch_op.create_index('ix_applications_job_submitted', ['job_id', 'submitted_at'], unique=False)
+        batch_op.create_index('ix_applications_applicant_submitted', ['applicant_id', 'submitted_at'], unique=False)
+        batch_op.create_index('ix_applications_job_applicant', ['job_id', 'applicant_id'], unique=False)
+
+    # job_seeker_dashboard: user_id, newest first; save_job / view_job: existence probe
+    with op.batch_alter_table('saved_jobs', schema=None) as batch_op:
+        batch_op.create_index('ix_saved_jobs_user_saved', ['user_id', 'saved_at'], unique=False)
+        batch_op.create_index('ix_saved_jobs_user_job', ['user_id', 'job_id'], unique=False)
+
+    # apply_job / upload_resume / view_applications: resumes by owner
+    with op.batch_alter_table('resumes', schema=None) as batch_op:
+        batch_op.create_index('ix_resumes_user_id', ['user_id'], unique=False)
+
+
+def downgrade():
+    with op.batch_alter_table('resumes', schema=None) as batch_op:
+        batch_op.drop_index('ix_resumes_user_id')
+
+    with op.batch_alter_table('saved_jobs', schema=None) as batch_op:
+        batch_op.drop_index('ix_saved_jobs_user_job')
+        batch_op.drop_index('ix_saved_jobs_user_saved')
+
+    with op.batch_alter_table('applications', schema=None) as batch_op:
+        batch_op.drop_index('ix_applications_job_applicant')
+        batch_op.drop_index('ix_applications_applicant_submitted')
+        batch_op.drop_index('ix_applications_job_submitted')
+
+    with op.batch_alter_table('job_postings', schema=None) as batch_op:
+        batch_op.drop_index('ix_job_postings_employer_created')
+        batch_op.drop_index('ix_job_postings_status_geohash')
+        batch_op.create_index('ix_job_postings_geohash', ['geohash'], unique=False)